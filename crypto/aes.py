@@ -1,9 +1,230 @@
+from collections import OrderedDict
+import struct
+import threading
+
 from group_theory.galois_field import GaloisField
 
+
+def _xtime(a):
+    """Multiply a byte by x (i.e. 0x02) in GF(2^8) modulo the AES polynomial."""
+    a <<= 1
+    return (a ^ 0x11b) if a & 0x100 else a
+
+
+def _gf_mult(a, b):
+    """Multiply two bytes in GF(2^8) modulo the AES polynomial x^8 + x^4 + x^3 + x + 1."""
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = _xtime(a)
+        b >>= 1
+    return result
+
+
+def _build_round_tables(box, coefficients):
+    """
+    Build the four 32-bit round lookup tables for a substitution box.
+
+    Entry ``x`` of the first table packs the column produced by substituting ``x``
+    and multiplying it by ``coefficients``; the other three tables are the same
+    words rotated right by 8, 16 and 24 bits.
+
+    Args:
+        box (list): The substitution box (S-box or inverse S-box).
+        coefficients (tuple): The four MixColumns coefficients, top to bottom.
+
+    Returns:
+        tuple: The four lookup tables as lists of 256 ints.
+    """
+    t0 = []
+    for x in range(256):
+        word = 0
+        for c in coefficients:
+            word = (word << 8) | _gf_mult(box[x], c)
+        t0.append(word)
+    t1 = [((w >> 8) | (w << 24)) & 0xFFFFFFFF for w in t0]
+    t2 = [((w >> 16) | (w << 16)) & 0xFFFFFFFF for w in t0]
+    t3 = [((w >> 24) | (w << 8)) & 0xFFFFFFFF for w in t0]
+    return t0, t1, t2, t3
+
+
+def _as_byte_list(data, name):
+    """
+    Convert a block-like value into a list of byte values.
+
+    Args:
+        data (list | bytes | bytearray | memoryview): The value to convert.
+        name (str): The name of the argument, used in error messages.
+
+    Returns:
+        list: The byte values.
+
+    Raises:
+        ValueError: If the value is not a sequence of byte values.
+    """
+    if isinstance(data, str):
+        raise ValueError(f"Invalid input type for {name}. Expected a sequence of bytes.")
+    try:
+        return list(bytes(data))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid input type for {name}. Expected a sequence of bytes.") from None
+
+
+def _as_buffer(data, name):
+    """
+    Expose a bytes-like value as a flat, read-only byte memoryview without copying it.
+
+    Args:
+        data (bytes | bytearray | memoryview | list): The value to expose. Lists of
+            byte values are copied into a bytes object first.
+        name (str): The name of the argument, used in error messages.
+
+    Returns:
+        memoryview: A one-dimensional view of unsigned bytes.
+
+    Raises:
+        ValueError: If the value is not bytes-like.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        view = memoryview(data)
+        return view if view.format == 'B' and view.ndim == 1 else view.cast('B')
+    if isinstance(data, list):
+        return memoryview(bytes(_as_byte_list(data, name)))
+    raise ValueError(f"Invalid input type for {name}. Expected bytes, bytearray or memoryview.")
+
+
+_BLOCK = struct.Struct('>4I')
+
+
+class KeyScheduleCache:
+    """
+    Bounded LRU cache of expanded AES key schedules, keyed by the raw key bytes.
+
+    Each entry holds the encryption schedule and the equivalent-inverse
+    decryption schedule as immutable tuples. Callers share the cached objects
+    and may still be using them after the key is evicted, so entries are only
+    dropped, never wiped in place; Python cannot reliably scrub int objects
+    anyway.
+    """
+
+    def __init__(self, maxsize=256):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize (int): The maximum number of keys whose schedules are kept.
+
+        Raises:
+            ValueError: If maxsize is not a positive integer.
+        """
+        if not isinstance(maxsize, int) or maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, expand):
+        """
+        Return the cached schedules for a key, expanding them on a miss.
+
+        Args:
+            key (bytes): The cipher key.
+            expand (callable): Called with the key on a miss; must return the
+                tuple of schedules to cache, which must not be mutated afterwards.
+
+        Returns:
+            tuple: The cached schedules for the key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        entry = expand(key)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        """Drop every cached schedule, and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
 class AES(GaloisField):
-    """Represents the AES (Advanced Encryption Standard) algorithm using Galois fields."""
+    """
+    Represents the AES (Advanced Encryption Standard) algorithm using Galois fields.
+
+    Rounds are computed with the classic 32-bit T-table formulation: SubBytes,
+    ShiftRows and MixColumns are folded into four lookup tables per direction
+    (``Te0``..``Te3`` and ``Td0``..``Td3``), built once when the class is loaded.
+    The state is held as four big-endian column words.
+    """
+
+    s_box = [
+        # S-box values
+        0x63, 0x7c, 0x77, 0x7b, 0xf2, 0x6b, 0x6f, 0xc5, 0x30, 0x01, 0x67, 0x2b, 0xfe, 0xd7, 0xab, 0x76,
+        0xca, 0x82, 0xc9, 0x7d, 0xfa, 0x59, 0x47, 0xf0, 0xad, 0xd4, 0xa2, 0xaf, 0x9c, 0xa4, 0x72, 0xc0,
+        0xb7, 0xfd, 0x93, 0x26, 0x36, 0x3f, 0xf7, 0xcc, 0x34, 0xa5, 0xe5, 0xf1, 0x71, 0xd8, 0x31, 0x15,
+        0x04, 0xc7, 0x23, 0xc3, 0x18, 0x96, 0x05, 0x9a, 0x07, 0x12, 0x80, 0xe2, 0xeb, 0x27, 0xb2, 0x75,
+        0x09, 0x83, 0x2c, 0x1a, 0x1b, 0x6e, 0x5a, 0xa0, 0x52, 0x3b, 0xd6, 0xb3, 0x29, 0xe3, 0x2f, 0x84,
+        0x53, 0xd1, 0x00, 0xed, 0x20, 0xfc, 0xb1, 0x5b, 0x6a, 0xcb, 0xbe, 0x39, 0x4a, 0x4c, 0x58, 0xcf,
+        0xd0, 0xef, 0xaa, 0xfb, 0x43, 0x4d, 0x33, 0x85, 0x45, 0xf9, 0x02, 0x7f, 0x50, 0x3c, 0x9f, 0xa8,
+        0x51, 0xa3, 0x40, 0x8f, 0x92, 0x9d, 0x38, 0xf5, 0xbc, 0xb6, 0xda, 0x21, 0x10, 0xff, 0xf3, 0xd2,
+        0xcd, 0x0c, 0x13, 0xec, 0x5f, 0x97, 0x44, 0x17, 0xc4, 0xa7, 0x7e, 0x3d, 0x64, 0x5d, 0x19, 0x73,
+        0x60, 0x81, 0x4f, 0xdc, 0x22, 0x2a, 0x90, 0x88, 0x46, 0xee, 0xb8, 0x14, 0xde, 0x5e, 0x0b, 0xdb,
+        0xe0, 0x32, 0x3a, 0x0a, 0x49, 0x06, 0x24, 0x5c, 0xc2, 0xd3, 0xac, 0x62, 0x91, 0x95, 0xe4, 0x79,
+        0xe7, 0xc8, 0x37, 0x6d, 0x8d, 0xd5, 0x4e, 0xa9, 0x6c, 0x56, 0xf4, 0xea, 0x65, 0x7a, 0xae, 0x08,
+        0xba, 0x78, 0x25, 0x2e, 0x1c, 0xa6, 0xb4, 0xc6, 0xe8, 0xdd, 0x74, 0x1f, 0x4b, 0xbd, 0x8b, 0x8a,
+        0x70, 0x3e, 0xb5, 0x66, 0x48, 0x03, 0xf6, 0x0e, 0x61, 0x35, 0x57, 0xb9, 0x86, 0xc1, 0x1d, 0x9e,
+        0xe1, 0xf8, 0x98, 0x11, 0x69, 0xd9, 0x8e, 0x94, 0x9b, 0x1e, 0x87, 0xe9, 0xce, 0x55, 0x28, 0xdf,
+        0x8c, 0xa1, 0x89, 0x0d, 0xbf, 0xe6, 0x42, 0x68, 0x41, 0x99, 0x2d, 0x0f, 0xb0, 0x54, 0xbb, 0x16
+    ]
+    inv_s_box = [
+        # Inverse S-box values
+        0x52, 0x09, 0x6a, 0xd5, 0x30, 0x36, 0xa5, 0x38, 0xbf, 0x40, 0xa3, 0x9e, 0x81, 0xf3, 0xd7, 0xfb,
+        0x7c, 0xe3, 0x39, 0x82, 0x9b, 0x2f, 0xff, 0x87, 0x34, 0x8e, 0x43, 0x44, 0xc4, 0xde, 0xe9, 0xcb,
+        0x54, 0x7b, 0x94, 0x32, 0xa6, 0xc2, 0x23, 0x3d, 0xee, 0x4c, 0x95, 0x0b, 0x42, 0xfa, 0xc3, 0x4e,
+        0x08, 0x2e, 0xa1, 0x66, 0x28, 0xd9, 0x24, 0xb2, 0x76, 0x5b, 0xa2, 0x49, 0x6d, 0x8b, 0xd1, 0x25,
+        0x72, 0xf8, 0xf6, 0x64, 0x86, 0x68, 0x98, 0x16, 0xd4, 0xa4, 0x5c, 0xcc, 0x5d, 0x65, 0xb6, 0x92,
+        0x6c, 0x70, 0x48, 0x50, 0xfd, 0xed, 0xb9, 0xda, 0x5e, 0x15, 0x46, 0x57, 0xa7, 0x8d, 0x9d, 0x84,
+        0x90, 0xd8, 0xab, 0x00, 0x8c, 0xbc, 0xd3, 0x0a, 0xf7, 0xe4, 0x58, 0x05, 0xb8, 0xb3, 0x45, 0x06,
+        0xd0, 0x2c, 0x1e, 0x8f, 0xca, 0x3f, 0x0f, 0x02, 0xc1, 0xaf, 0xbd, 0x03, 0x01, 0x13, 0x8a, 0x6b,
+        0x3a, 0x91, 0x11, 0x41, 0x4f, 0x67, 0xdc, 0xea, 0x97, 0xf2, 0xcf, 0xce, 0xf0, 0xb4, 0xe6, 0x73,
+        0x96, 0xac, 0x74, 0x22, 0xe7, 0xad, 0x35, 0x85, 0xe2, 0xf9, 0x37, 0xe8, 0x1c, 0x75, 0xdf, 0x6e,
+        0x47, 0xf1, 0x1a, 0x71, 0x1d, 0x29, 0xc5, 0x89, 0x6f, 0xb7, 0x62, 0x0e, 0xaa, 0x18, 0xbe, 0x1b,
+        0xfc, 0x56, 0x3e, 0x4b, 0xc6, 0xd2, 0x79, 0x20, 0x9a, 0xdb, 0xc0, 0xfe, 0x78, 0xcd, 0x5a, 0xf4,
+        0x1f, 0xdd, 0xa8, 0x33, 0x88, 0x07, 0xc7, 0x31, 0xb1, 0x12, 0x10, 0x59, 0x27, 0x80, 0xec, 0x5f,
+        0x60, 0x51, 0x7f, 0xa9, 0x19, 0xb5, 0x4a, 0x0d, 0x2d, 0xe5, 0x7a, 0x9f, 0x93, 0xc9, 0x9c, 0xef,
+        0xa0, 0xe0, 0x3b, 0x4d, 0xae, 0x2a, 0xf5, 0xb0, 0xc8, 0xeb, 0xbb, 0x3c, 0x83, 0x53, 0x99, 0x61,
+        0x17, 0x2b, 0x04, 0x7e, 0xba, 0x77, 0xd6, 0x26, 0xe1, 0x69, 0x14, 0x63, 0x55, 0x21, 0x0c, 0x7d
+    ]
+    rcon = [
+        # Rcon values
+        0x8d, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36
+    ]
+
+    # Key length in bytes -> (Nk, Nr): the number of 32-bit words comprising the
+    # Cipher Key and the number of rounds, for AES-128, AES-192 and AES-256.
+    key_sizes = {16: (4, 10), 24: (6, 12), 32: (8, 14)}
+
+    Te0, Te1, Te2, Te3 = _build_round_tables(s_box, (2, 1, 1, 3))
+    Td0, Td1, Td2, Td3 = _build_round_tables(inv_s_box, (14, 9, 13, 11))
 
-    def __init__(self, elements, addition, multiplication):
+    def __init__(self, elements, addition, multiplication, schedule_cache_size=256):
         """
         Initialize the AES algorithm with elements, addition, and multiplication operations.
 
@@ -11,171 +232,429 @@ class AES(GaloisField):
             elements (set): The set of elements in the Galois field.
             addition (callable): The addition operation for the Galois field.
             multiplication (callable): The multiplication operation for the Galois field.
+            schedule_cache_size (int): The number of expanded key schedules to keep cached.
         """
         super().__init__(elements, addition, multiplication)
+        self.schedule_cache = KeyScheduleCache(schedule_cache_size)
         self.Nb = 4  # Number of columns (32-bit words) comprising the State. For AES, Nb = 4.
-        self.Nk = 4  # Number of 32-bit words comprising the Cipher Key. For AES-128, Nk = 4.
-        self.Nr = 10  # Number of rounds, which is a function of Nk and Nb (which is fixed). For AES-128, Nr = 10.
-        self.s_box = [
-            # S-box values
-            0x63, 0x7c, 0x77, 0x7b, 0xf2, 0x6b, 0x6f, 0xc5, 0x30, 0x01, 0x67, 0x2b, 0xfe, 0xd7, 0xab, 0x76,
-            0xca, 0x82, 0xc9, 0x7d, 0xfa, 0x59, 0x47, 0xf0, 0xad, 0xd4, 0xa2, 0xaf, 0x9c, 0xa4, 0x72, 0xc0,
-            0xb7, 0xfd, 0x93, 0x26, 0x36, 0x3f, 0xf7, 0xcc, 0x34, 0xa5, 0xe5, 0xf1, 0x71, 0xd8, 0x31, 0x15,
-            0x04, 0xc7, 0x23, 0xc3, 0x18, 0x96, 0x05, 0x9a, 0x07, 0x12, 0x80, 0xe2, 0xeb, 0x27, 0xb2, 0x75,
-            0x09, 0x83, 0x2c, 0x1a, 0x1b, 0x6e, 0x5a, 0xa0, 0x52, 0x3b, 0xd6, 0xb3, 0x29, 0xe3, 0x2f, 0x84,
-            0x53, 0xd1, 0x00, 0xed, 0x20, 0xfc, 0xb1, 0x5b, 0x6a, 0xcb, 0xbe, 0x39, 0x4a, 0x4c, 0x58, 0xcf,
-            0xd0, 0xef, 0xaa, 0xfb, 0x43, 0x4d, 0x33, 0x85, 0x45, 0xf9, 0x02, 0x7f, 0x50, 0x3c, 0x9f, 0xa8,
-            0x51, 0xa3, 0x40, 0x8f, 0x92, 0x9d, 0x38, 0xf5, 0xbc, 0xb6, 0xda, 0x21, 0x10, 0xff, 0xf3, 0xd2,
-            0xcd, 0x0c, 0x13, 0xec, 0x5f, 0x97, 0x44, 0x17, 0xc4, 0xa7, 0x7e, 0x3d, 0x64, 0x5d, 0x19, 0x73,
-            0x60, 0x81, 0x4f, 0xdc, 0x22, 0x2a, 0x90, 0x88, 0x46, 0xee, 0xb8, 0x14, 0xde, 0x5e, 0x0b, 0xdb,
-            0xe0, 0x32, 0x3a, 0x0a, 0x49, 0x06, 0x24, 0x5c, 0xc2, 0xd3, 0xac, 0x62, 0x91, 0x95, 0xe4, 0x79,
-            0xe7, 0xc8, 0x37, 0x6d, 0x8d, 0xd5, 0x4e, 0xa9, 0x6c, 0x56, 0xf4, 0xea, 0x65, 0x7a, 0xae, 0x08,
-            0xba, 0x78, 0x25, 0x2e, 0x1c, 0xa6, 0xb4, 0xc6, 0xe8, 0xdd, 0x74, 0x1f, 0x4b, 0xbd, 0x8b, 0x8a,
-            0x70, 0x3e, 0xb5, 0x66, 0x48, 0x03, 0xf6, 0x0e, 0x61, 0x35, 0x57, 0xb9, 0x86, 0xc1, 0x1d, 0x9e,
-            0xe1, 0xf8, 0x98, 0x11, 0x69, 0xd9, 0x8e, 0x94, 0x9b, 0x1e, 0x87, 0xe9, 0xce, 0x55, 0x28, 0xdf,
-            0x8c, 0xa1, 0x89, 0x0d, 0xbf, 0xe6, 0x42, 0x68, 0x41, 0x99, 0x2d, 0x0f, 0xb0, 0x54, 0xbb, 0x16
-        ]
-        self.inv_s_box = [
-            # Inverse S-box values
-            0x52, 0x09, 0x6a, 0xd5, 0x30, 0x36, 0xa5, 0x38, 0xbf, 0x40, 0xa3, 0x9e, 0x81, 0xf3, 0xd7, 0xfb,
-            0x7c, 0xe3, 0x39, 0x82, 0x9b, 0x2f, 0xff, 0x87, 0x34, 0x8e, 0x43, 0x44, 0xc4, 0xde, 0xe9, 0xcb,
-            0x54, 0x7b, 0x94, 0x32, 0xa6, 0xc2, 0x23, 0x3d, 0xee, 0x4c, 0x95, 0x0b, 0x42, 0xfa, 0xc3, 0x4e,
-            0x08, 0x2e, 0xa1, 0x66, 0x28, 0xd9, 0x24, 0xb2, 0x76, 0x5b, 0xa2, 0x49, 0x6d, 0x8b, 0xd1, 0x25,
-            0x72, 0xf8, 0xf6, 0x64, 0x86, 0x68, 0x98, 0x16, 0xd4, 0xa4, 0x5c, 0xcc, 0x5d, 0x65, 0xb6, 0x92,
-            0x6c, 0x70, 0x48, 0x50, 0xfd, 0xed, 0xb9, 0xda, 0x5e, 0x15, 0x46, 0x57, 0xa7, 0x8d, 0x9d, 0x84,
-            0x90, 0xd8, 0xab, 0x00, 0x8c, 0xbc, 0xd3, 0x0a, 0xf7, 0xe4, 0x58, 0x05, 0xb8, 0xb3, 0x45, 0x06,
-            0xd0, 0x2c, 0x1e, 0x8f, 0xca, 0x3f, 0x0f, 0x02, 0xc1, 0xaf, 0xbd, 0x03, 0x01, 0x13, 0x8a, 0x6b,
-            0x3a, 0x91, 0x11, 0x41, 0x4f, 0x67, 0xdc, 0xea, 0x97, 0xf2, 0xcf, 0xce, 0xf0, 0xb4, 0xe6, 0x73,
-            0x96, 0xac, 0x74, 0x22, 0xe7, 0xad, 0x35, 0x85, 0xe2, 0xf9, 0x37, 0xe8, 0x1c, 0x75, 0xdf, 0x6e,
-            0x47, 0xf1, 0x1a, 0x71, 0x1d, 0x29, 0xc5, 0x89, 0x6f, 0xb7, 0x62, 0x0e, 0xaa, 0x18, 0xbe, 0x1b,
-            0xfc, 0x56, 0x3e, 0x4b, 0xc6, 0xd2, 0x79, 0x20, 0x9a, 0xdb, 0xc0, 0xfe, 0x78, 0xcd, 0x5a, 0xf4,
-            0x1f, 0xdd, 0xa8, 0x33, 0x88, 0x07, 0xc7, 0x31, 0xb1, 0x12, 0x10, 0x59, 0x27, 0x80, 0xec, 0x5f,
-            0x60, 0x51, 0x7f, 0xa9, 0x19, 0xb5, 0x4a, 0x0d, 0x2d, 0xe5, 0x7a, 0x9f, 0x93, 0xc9, 0x9c, 0xef,
-            0xa0, 0xe0, 0x3b, 0x4d, 0xae, 0x2a, 0xf5, 0xb0, 0xc8, 0xeb, 0xbb, 0x3c, 0x83, 0x53, 0x99, 0x61,
-            0x17, 0x2b, 0x04, 0x7e, 0xba, 0x77, 0xd6, 0x26, 0xe1, 0x69, 0x14, 0x63, 0x55, 0x21, 0x0c, 0x7d
-        ]
-        self.rcon = [
-            # Rcon values
-            0x8d, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36
-        ]
+
+    def galois_mult(self, a, b):
+        """
+        Multiply two bytes in GF(2^8) using the AES reduction polynomial.
+
+        Args:
+            a (int): The first byte.
+            b (int): The second byte.
+
+        Returns:
+            int: The product of a and b.
+        """
+        return _gf_mult(a, b)
 
     def key_expansion(self, key):
         """
         Perform key expansion to generate round keys.
 
+        The key length selects the variant: 16, 24 and 32-byte keys give
+        AES-128, AES-192 and AES-256 with 10, 12 and 14 rounds.
+
+        Args:
+            key (list): The cipher key.
+
+        Returns:
+            list: The expanded key schedule as 32-bit words.
+
+        Raises:
+            ValueError: If the key is not a sequence of bytes or has an invalid length.
+        """
+        key = _as_byte_list(key, "key")
+        if len(key) not in self.key_sizes:
+            raise ValueError("Invalid key length. Key must be 16, 24 or 32 bytes long.")
+        Nk, Nr = self.key_sizes[len(key)]
+        s_box = self.s_box
+        w = [int.from_bytes(bytes(key[4 * i:4 * (i + 1)]), 'big') for i in range(Nk)]
+        for i in range(Nk, self.Nb * (Nr + 1)):
+            temp = w[i - 1]
+            if i % Nk == 0:
+                # SubWord(RotWord(temp)) xor Rcon
+                temp = ((s_box[(temp >> 16) & 0xFF] << 24) | (s_box[(temp >> 8) & 0xFF] << 16) |
+                        (s_box[temp & 0xFF] << 8) | s_box[temp >> 24])
+                temp ^= self.rcon[i // Nk] << 24
+            elif Nk > 6 and i % Nk == 4:
+                temp = ((s_box[temp >> 24] << 24) | (s_box[(temp >> 16) & 0xFF] << 16) |
+                        (s_box[(temp >> 8) & 0xFF] << 8) | s_box[temp & 0xFF])
+            w.append(w[i - Nk] ^ temp)
+        return w
+
+    def inv_key_expansion(self, key):
+        """
+        Generate the round keys for the equivalent inverse cipher.
+
+        The encryption schedule is reversed round by round and InvMixColumns is
+        applied to the inner round keys, so decryption can use the ``Td`` tables
+        with the same round structure as encryption.
+
         Args:
             key (list): The cipher key.
 
         Returns:
-            list: The expanded key schedule.
+            list: The decryption key schedule as 32-bit words.
         """
-        # Key expansion logic
-        def sub_word(word):
-            return [self.s_box[b] for b in word]
+        w = self.key_expansion(key)
+        Nb, Nr = self.Nb, self._rounds(w)
+        s_box = self.s_box
+        Td0, Td1, Td2, Td3 = self.Td0, self.Td1, self.Td2, self.Td3
+        dw = list(w[Nr * Nb:(Nr + 1) * Nb])
+        for round in range(Nr - 1, 0, -1):
+            for word in w[round * Nb:(round + 1) * Nb]:
+                dw.append(Td0[s_box[word >> 24]] ^ Td1[s_box[(word >> 16) & 0xFF]] ^
+                          Td2[s_box[(word >> 8) & 0xFF]] ^ Td3[s_box[word & 0xFF]])
+        dw.extend(w[:Nb])
+        return dw
 
-        def rot_word(word):
-            return word[1:] + word[:1]
+    @staticmethod
+    def _rounds(schedule):
+        """Return the number of rounds Nr encoded by the length of a key schedule."""
+        return len(schedule) // 4 - 1
 
-        w = [0] * (self.Nb * (self.Nr + 1))
-        for i in range(self.Nk):
-            w[i] = key[4 * i: 4 * (i + 1)]
+    def key_schedule(self, key):
+        """
+        Return the encryption and decryption schedules for a key, using the cache.
 
-        for i in range(self.Nk, self.Nb * (self.Nr + 1)):
-            temp = w[i - 1]
-            if i % self.Nk == 0:
-                temp = sub_word(rot_word(temp))
-                temp[0] ^= self.rcon[i // self.Nk]
-            elif self.Nk > 6 and i % self.Nk == 4:
-                temp = sub_word(temp)
-            w[i] = [w[i - self.Nk][j] ^ temp[j] for j in range(4)]
-        return w
+        Schedules for every key size live in the same cache; the round count is
+        implied by the schedule length.
+
+        Args:
+            key (list | bytes): The cipher key.
+
+        Returns:
+            tuple: The encryption schedule and the decryption schedule.
+        """
+        key = bytes(_as_byte_list(key, "key"))
+        return self.schedule_cache.get(key, self._expand_schedules)
+
+    def _expand_schedules(self, key):
+        """Expand both key schedules for a cache miss, as tuples that cannot be changed in place."""
+        return tuple(self.key_expansion(key)), tuple(self.inv_key_expansion(key))
+
+    def _encrypt_words(self, s0, s1, s2, s3, rk, Nr):
+        """
+        Encrypt a single block held as four column words.
+
+        Args:
+            s0, s1, s2, s3 (int): The state columns as big-endian 32-bit words.
+            rk (list): The encryption key schedule.
+            Nr (int): The number of rounds.
+
+        Returns:
+            tuple: The four ciphertext column words.
+        """
+        Te0, Te1, Te2, Te3 = self.Te0, self.Te1, self.Te2, self.Te3
+        s0 ^= rk[0]
+        s1 ^= rk[1]
+        s2 ^= rk[2]
+        s3 ^= rk[3]
+        k = 4
+        for _ in range(1, Nr):
+            t0 = Te0[s0 >> 24] ^ Te1[(s1 >> 16) & 0xFF] ^ Te2[(s2 >> 8) & 0xFF] ^ Te3[s3 & 0xFF] ^ rk[k]
+            t1 = Te0[s1 >> 24] ^ Te1[(s2 >> 16) & 0xFF] ^ Te2[(s3 >> 8) & 0xFF] ^ Te3[s0 & 0xFF] ^ rk[k + 1]
+            t2 = Te0[s2 >> 24] ^ Te1[(s3 >> 16) & 0xFF] ^ Te2[(s0 >> 8) & 0xFF] ^ Te3[s1 & 0xFF] ^ rk[k + 2]
+            t3 = Te0[s3 >> 24] ^ Te1[(s0 >> 16) & 0xFF] ^ Te2[(s1 >> 8) & 0xFF] ^ Te3[s2 & 0xFF] ^ rk[k + 3]
+            s0, s1, s2, s3 = t0, t1, t2, t3
+            k += 4
+        # Final round: SubBytes and ShiftRows only, no MixColumns
+        s_box = self.s_box
+        return (
+            ((s_box[s0 >> 24] << 24) | (s_box[(s1 >> 16) & 0xFF] << 16) |
+             (s_box[(s2 >> 8) & 0xFF] << 8) | s_box[s3 & 0xFF]) ^ rk[k],
+            ((s_box[s1 >> 24] << 24) | (s_box[(s2 >> 16) & 0xFF] << 16) |
+             (s_box[(s3 >> 8) & 0xFF] << 8) | s_box[s0 & 0xFF]) ^ rk[k + 1],
+            ((s_box[s2 >> 24] << 24) | (s_box[(s3 >> 16) & 0xFF] << 16) |
+             (s_box[(s0 >> 8) & 0xFF] << 8) | s_box[s1 & 0xFF]) ^ rk[k + 2],
+            ((s_box[s3 >> 24] << 24) | (s_box[(s0 >> 16) & 0xFF] << 16) |
+             (s_box[(s1 >> 8) & 0xFF] << 8) | s_box[s2 & 0xFF]) ^ rk[k + 3],
+        )
+
+    def _decrypt_words(self, s0, s1, s2, s3, drk, Nr):
+        """
+        Decrypt a single block held as four column words.
+
+        Args:
+            s0, s1, s2, s3 (int): The state columns as big-endian 32-bit words.
+            drk (list): The decryption key schedule from ``inv_key_expansion``.
+            Nr (int): The number of rounds.
+
+        Returns:
+            tuple: The four plaintext column words.
+        """
+        Td0, Td1, Td2, Td3 = self.Td0, self.Td1, self.Td2, self.Td3
+        s0 ^= drk[0]
+        s1 ^= drk[1]
+        s2 ^= drk[2]
+        s3 ^= drk[3]
+        k = 4
+        for _ in range(1, Nr):
+            t0 = Td0[s0 >> 24] ^ Td1[(s3 >> 16) & 0xFF] ^ Td2[(s2 >> 8) & 0xFF] ^ Td3[s1 & 0xFF] ^ drk[k]
+            t1 = Td0[s1 >> 24] ^ Td1[(s0 >> 16) & 0xFF] ^ Td2[(s3 >> 8) & 0xFF] ^ Td3[s2 & 0xFF] ^ drk[k + 1]
+            t2 = Td0[s2 >> 24] ^ Td1[(s1 >> 16) & 0xFF] ^ Td2[(s0 >> 8) & 0xFF] ^ Td3[s3 & 0xFF] ^ drk[k + 2]
+            t3 = Td0[s3 >> 24] ^ Td1[(s2 >> 16) & 0xFF] ^ Td2[(s1 >> 8) & 0xFF] ^ Td3[s0 & 0xFF] ^ drk[k + 3]
+            s0, s1, s2, s3 = t0, t1, t2, t3
+            k += 4
+        # Final round: InvShiftRows and InvSubBytes only, no InvMixColumns
+        inv_s_box = self.inv_s_box
+        return (
+            ((inv_s_box[s0 >> 24] << 24) | (inv_s_box[(s3 >> 16) & 0xFF] << 16) |
+             (inv_s_box[(s2 >> 8) & 0xFF] << 8) | inv_s_box[s1 & 0xFF]) ^ drk[k],
+            ((inv_s_box[s1 >> 24] << 24) | (inv_s_box[(s0 >> 16) & 0xFF] << 16) |
+             (inv_s_box[(s3 >> 8) & 0xFF] << 8) | inv_s_box[s2 & 0xFF]) ^ drk[k + 1],
+            ((inv_s_box[s2 >> 24] << 24) | (inv_s_box[(s1 >> 16) & 0xFF] << 16) |
+             (inv_s_box[(s0 >> 8) & 0xFF] << 8) | inv_s_box[s3 & 0xFF]) ^ drk[k + 2],
+            ((inv_s_box[s3 >> 24] << 24) | (inv_s_box[(s2 >> 16) & 0xFF] << 16) |
+             (inv_s_box[(s1 >> 8) & 0xFF] << 8) | inv_s_box[s0 & 0xFF]) ^ drk[k + 3],
+        )
 
     def encrypt(self, plaintext, key):
         """
         Encrypt the plaintext using the provided key.
 
         Args:
-            plaintext (list): The plaintext to encrypt.
+            plaintext (list): The 16-byte plaintext block to encrypt.
             key (list): The encryption key.
 
         Returns:
             list: The encrypted ciphertext.
+
+        Raises:
+            ValueError: If the plaintext is not a 16-byte block or the key is invalid.
         """
-        # Encryption logic
-        state = [plaintext[i:i + 4] for i in range(0, len(plaintext), 4)]
-        round_keys = self.key_expansion(key)
-
-        def add_round_key(state, round_key):
-            return [[state[i][j] ^ round_key[i][j] for j in range(4)] for i in range(4)]
-
-        def sub_bytes(state):
-            return [[self.s_box[b] for b in row] for row in state]
-
-        def shift_rows(state):
-            return [state[0], state[1][1:] + state[1][:1], state[2][2:] + state[2][:2], state[3][3:] + state[3][:3]]
-
-        def mix_columns(state):
-            def mix_single_column(column):
-                return [
-                    self.galois_mult(column[0], 2) ^ self.galois_mult(column[1], 3) ^ column[2] ^ column[3],
-                    column[0] ^ self.galois_mult(column[1], 2) ^ self.galois_mult(column[2], 3) ^ column[3],
-                    column[0] ^ column[1] ^ self.galois_mult(column[2], 2) ^ self.galois_mult(column[3], 3),
-                    self.galois_mult(column[0], 3) ^ column[1] ^ column[2] ^ self.galois_mult(column[3], 2)
-                ]
-            return [mix_single_column(col) for col in zip(*state)]
-
-        state = add_round_key(state, round_keys[:self.Nb])
-        for round in range(1, self.Nr):
-            state = sub_bytes(state)
-            state = shift_rows(state)
-            state = mix_columns(state)
-            state = add_round_key(state, round_keys[round * self.Nb:(round + 1) * self.Nb])
-        state = sub_bytes(state)
-        state = shift_rows(state)
-        state = add_round_key(state, round_keys[self.Nr * self.Nb:])
-        return [byte for row in state for byte in row]
+        block = _as_byte_list(plaintext, "plaintext")
+        if len(block) != 4 * self.Nb:
+            raise ValueError("Invalid block length. Plaintext must be 16 bytes long.")
+        round_keys, _ = self.key_schedule(key)
+        words = self._encrypt_words(*(int.from_bytes(bytes(block[i:i + 4]), 'big') for i in range(0, 16, 4)),
+                                    round_keys, self._rounds(round_keys))
+        return list(b''.join(word.to_bytes(4, 'big') for word in words))
 
     def decrypt(self, ciphertext, key):
         """
         Decrypt the ciphertext using the provided key.
 
         Args:
-            ciphertext (list): The ciphertext to decrypt.
+            ciphertext (list): The 16-byte ciphertext block to decrypt.
             key (list): The decryption key.
 
         Returns:
             list: The decrypted plaintext.
+
+        Raises:
+            ValueError: If the ciphertext is not a 16-byte block or the key is invalid.
+        """
+        block = _as_byte_list(ciphertext, "ciphertext")
+        if len(block) != 4 * self.Nb:
+            raise ValueError("Invalid block length. Ciphertext must be 16 bytes long.")
+        _, round_keys = self.key_schedule(key)
+        words = self._decrypt_words(*(int.from_bytes(bytes(block[i:i + 4]), 'big') for i in range(0, 16, 4)),
+                                    round_keys, self._rounds(round_keys))
+        return list(b''.join(word.to_bytes(4, 'big') for word in words))
+
+    def _ecb_into(self, src, dst, schedule, Nr, decrypt=False):
+        """
+        Run the block cipher over whole blocks of src, writing into dst.
+
+        Args:
+            src (memoryview): The input; its length must be a multiple of 16.
+            dst (memoryview | bytearray): The writable output, at least as long as src.
+            schedule (list): The encryption or decryption key schedule.
+            Nr (int): The number of rounds.
+            decrypt (bool): Whether to run the inverse cipher.
+        """
+        transform = self._decrypt_words if decrypt else self._encrypt_words
+        unpack_from, pack_into = _BLOCK.unpack_from, _BLOCK.pack_into
+        for offset in range(0, len(src), 16):
+            pack_into(dst, offset, *transform(*unpack_from(src, offset), schedule, Nr))
+
+    def _ctr_into(self, src, dst, schedule, Nr, counter):
+        """
+        XOR src with the CTR keystream starting at counter, writing into dst.
+
+        Args:
+            src (memoryview): The input of any length.
+            dst (memoryview | bytearray): The writable output, at least as long as src.
+            schedule (list): The encryption key schedule.
+            Nr (int): The number of rounds.
+            counter (int): The 128-bit counter block for the first block.
+
+        Returns:
+            int: The counter block following the last one used.
+        """
+        unpack_from, pack_into = _BLOCK.unpack_from, _BLOCK.pack_into
+        encrypt_words = self._encrypt_words
+        full = len(src) - len(src) % 16
+        for offset in range(0, full, 16):
+            k0, k1, k2, k3 = encrypt_words(counter >> 96, (counter >> 64) & 0xFFFFFFFF,
+                                           (counter >> 32) & 0xFFFFFFFF, counter & 0xFFFFFFFF, schedule, Nr)
+            p0, p1, p2, p3 = unpack_from(src, offset)
+            pack_into(dst, offset, p0 ^ k0, p1 ^ k1, p2 ^ k2, p3 ^ k3)
+            counter = (counter + 1) & ((1 << 128) - 1)
+        if full < len(src):
+            keystream = _BLOCK.pack(*encrypt_words(counter >> 96, (counter >> 64) & 0xFFFFFFFF,
+                                                   (counter >> 32) & 0xFFFFFFFF, counter & 0xFFFFFFFF, schedule, Nr))
+            for i in range(len(src) - full):
+                dst[full + i] = src[full + i] ^ keystream[i]
+            counter = (counter + 1) & ((1 << 128) - 1)
+        return counter
+
+    @staticmethod
+    def _check_iv(iv, name):
+        """Validate a 16-byte IV or initial counter block and return it as an int."""
+        if not isinstance(iv, (bytes, bytearray, memoryview)) or len(iv) != 16:
+            raise ValueError(f"Invalid {name}. It must be 16 bytes long.")
+        return int.from_bytes(iv, 'big')
+
+    @staticmethod
+    def _pad(tail):
+        """Return the final PKCS#7-padded block for the trailing partial block."""
+        pad = 16 - len(tail)
+        return bytes(tail) + bytes([pad]) * pad
+
+    @staticmethod
+    def _unpad_length(last_block):
+        """Return the number of PKCS#7 padding bytes in the final decrypted block."""
+        pad = last_block[-1]
+        if not 1 <= pad <= 16 or any(b != pad for b in last_block[16 - pad:]):
+            raise ValueError("Invalid padding.")
+        return pad
+
+    def encrypt_ecb(self, plaintext, key):
+        """
+        Encrypt data of any length in ECB mode with PKCS#7 padding.
+
+        Args:
+            plaintext (bytes | bytearray | memoryview): The data to encrypt.
+            key (bytes): The encryption key.
+
+        Returns:
+            bytearray: The ciphertext, padded to a multiple of 16 bytes.
+        """
+        src = _as_buffer(plaintext, "plaintext")
+        schedule, _ = self.key_schedule(key)
+        Nr = self._rounds(schedule)
+        full = len(src) - len(src) % 16
+        out = bytearray(full + 16)
+        self._ecb_into(src[:full], out, schedule, Nr)
+        self._ecb_into(memoryview(self._pad(src[full:])), memoryview(out)[full:], schedule, Nr)
+        return out
+
+    def decrypt_ecb(self, ciphertext, key):
+        """
+        Decrypt ECB-mode data and strip its PKCS#7 padding.
+
+        Args:
+            ciphertext (bytes | bytearray | memoryview): The data to decrypt.
+            key (bytes): The decryption key.
+
+        Returns:
+            bytearray: The plaintext.
+
+        Raises:
+            ValueError: If the ciphertext length or padding is invalid.
+        """
+        src = _as_buffer(ciphertext, "ciphertext")
+        if not src or len(src) % 16:
+            raise ValueError("Invalid ciphertext length. It must be a non-zero multiple of 16 bytes.")
+        _, schedule = self.key_schedule(key)
+        out = bytearray(len(src))
+        self._ecb_into(src, out, schedule, self._rounds(schedule), decrypt=True)
+        del out[len(out) - self._unpad_length(out[-16:]):]
+        return out
+
+    def encrypt_cbc(self, plaintext, key, iv):
+        """
+        Encrypt data of any length in CBC mode with PKCS#7 padding.
+
+        Args:
+            plaintext (bytes | bytearray | memoryview): The data to encrypt.
+            key (bytes): The encryption key.
+            iv (bytes): The 16-byte initialization vector.
+
+        Returns:
+            bytearray: The ciphertext, padded to a multiple of 16 bytes.
+        """
+        src = _as_buffer(plaintext, "plaintext")
+        self._check_iv(iv, "IV")
+        c0, c1, c2, c3 = _BLOCK.unpack(iv)
+        schedule, _ = self.key_schedule(key)
+        Nr = self._rounds(schedule)
+        full = len(src) - len(src) % 16
+        out = bytearray(full + 16)
+        unpack_from, pack_into = _BLOCK.unpack_from, _BLOCK.pack_into
+        encrypt_words = self._encrypt_words
+        for offset in range(0, full, 16):
+            p0, p1, p2, p3 = unpack_from(src, offset)
+            c0, c1, c2, c3 = encrypt_words(p0 ^ c0, p1 ^ c1, p2 ^ c2, p3 ^ c3, schedule, Nr)
+            pack_into(out, offset, c0, c1, c2, c3)
+        p0, p1, p2, p3 = _BLOCK.unpack(self._pad(src[full:]))
+        pack_into(out, full, *encrypt_words(p0 ^ c0, p1 ^ c1, p2 ^ c2, p3 ^ c3, schedule, Nr))
+        return out
+
+    def decrypt_cbc(self, ciphertext, key, iv):
+        """
+        Decrypt CBC-mode data and strip its PKCS#7 padding.
+
+        Args:
+            ciphertext (bytes | bytearray | memoryview): The data to decrypt.
+            key (bytes): The decryption key.
+            iv (bytes): The 16-byte initialization vector.
+
+        Returns:
+            bytearray: The plaintext.
+
+        Raises:
+            ValueError: If the IV, ciphertext length or padding is invalid.
         """
-        # Decryption logic
-        state = [ciphertext[i:i + 4] for i in range(0, len(ciphertext), 4)]
-        round_keys = self.key_expansion(key)
-
-        def add_round_key(state, round_key):
-            return [[state[i][j] ^ round_key[i][j] for j in range(4)] for i in range(4)]
-
-        def inv_sub_bytes(state):
-            return [[self.inv_s_box[b] for b in row] for row in state]
-
-        def inv_shift_rows(state):
-            return [state[0], state[1][-1:] + state[1][:-1], state[2][-2:] + state[2][-2], state[3][-3:] + state[3][-3]]
-
-        def inv_mix_columns(state):
-            def inv_mix_single_column(column):
-                return [
-                    self.galois_mult(column[0], 14) ^ self.galois_mult(column[1], 11) ^ self.galois_mult(column[2], 13) ^ self.galois_mult(column[3], 9),
-                    self.galois_mult(column[0], 9) ^ self.galois_mult(column[1], 14) ^ self.galois_mult(column[2], 11) ^ self.galois_mult(column[3], 13),
-                    self.galois_mult(column[0], 13) ^ self.galois_mult(column[1], 9) ^ self.galois_mult(column[2], 14) ^ self.galois_mult(column[3], 11),
-                    self.galois_mult(column[0], 11) ^ self.galois_mult(column[1], 13) ^ self.galois_mult(column[2], 9) ^ self.galois_mult(column[3], 14)
-                ]
-            return [inv_mix_single_column(col) for col in zip(*state)]
-
-        state = add_round_key(state, round_keys[self.Nr * self.Nb:])
-        for round in range(self.Nr - 1, 0, -1):
-            state = inv_shift_rows(state)
-            state = inv_sub_bytes(state)
-            state = add_round_key(state, round_keys[round * self.Nb:(round + 1) * self.Nb])
-            state = inv_mix_columns(state)
-        state = inv_shift_rows(state)
-        state = inv_sub_bytes(state)
-        state = add_round_key(state, round_keys[:self.Nb])
-        return [byte for row in state for byte in row]
+        src = _as_buffer(ciphertext, "ciphertext")
+        self._check_iv(iv, "IV")
+        if not src or len(src) % 16:
+            raise ValueError("Invalid ciphertext length. It must be a non-zero multiple of 16 bytes.")
+        _, schedule = self.key_schedule(key)
+        Nr = self._rounds(schedule)
+        out = bytearray(len(src))
+        unpack_from, pack_into = _BLOCK.unpack_from, _BLOCK.pack_into
+        decrypt_words = self._decrypt_words
+        v0, v1, v2, v3 = _BLOCK.unpack(iv)
+        for offset in range(0, len(src), 16):
+            c0, c1, c2, c3 = unpack_from(src, offset)
+            p0, p1, p2, p3 = decrypt_words(c0, c1, c2, c3, schedule, Nr)
+            pack_into(out, offset, p0 ^ v0, p1 ^ v1, p2 ^ v2, p3 ^ v3)
+            v0, v1, v2, v3 = c0, c1, c2, c3
+        del out[len(out) - self._unpad_length(out[-16:]):]
+        return out
+
+    def encrypt_ctr(self, data, key, counter, out=None):
+        """
+        Encrypt or decrypt data of any length in CTR mode.
+
+        The 16-byte initial counter block is incremented as a 128-bit big-endian
+        integer for each block. CTR is its own inverse, so the same call decrypts.
+
+        Args:
+            data (bytes | bytearray | memoryview): The data to process.
+            key (bytes): The encryption key.
+            counter (bytes): The 16-byte initial counter block.
+            out (bytearray | memoryview, optional): A writable buffer of at least
+                len(data) bytes to write into. A new bytearray is allocated if omitted.
+
+        Returns:
+            bytearray | memoryview: The output buffer.
+        """
+        src = _as_buffer(data, "data")
+        start = self._check_iv(counter, "counter block")
+        if out is None:
+            out = bytearray(len(src))
+        elif len(out) < len(src):
+            raise ValueError("Output buffer is too small.")
+        schedule, _ = self.key_schedule(key)
+        self._ctr_into(src, out, schedule, self._rounds(schedule), start)
+        return out
+
+    decrypt_ctr = encrypt_ctr
@@ -0,0 +1,146 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; BatchAES is unavailable without it
+    np = None
+
+from crypto.aes import AES, _as_buffer, _xtime
+
+
+class BatchAES:
+    """
+    Vectorized AES engine that encrypts many blocks at once with NumPy.
+
+    Blocks are held as rows of an (N, 16) uint8 array in the standard
+    column-major state layout. SubBytes is a fancy-indexing lookup into the
+    S-box, ShiftRows is a fixed column permutation and MixColumns uses a
+    precomputed xtime table, so every round is a handful of whole-array
+    operations regardless of N. Output is identical to ``AES.encrypt``.
+    """
+
+    # State index r + 4c takes the byte from row r of column (c + r) mod 4.
+    SHIFT_ROWS = [r + 4 * ((c + r) % 4) for c in range(4) for r in range(4)]
+
+    def __init__(self, aes, batch_blocks=65536):
+        """
+        Initialize the batch engine on top of a scalar AES instance.
+
+        Args:
+            aes (AES): The scalar cipher whose key schedule cache is reused.
+            batch_blocks (int): The number of blocks processed per vectorized pass,
+                which bounds the size of the temporary arrays.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If batch_blocks is not a positive integer.
+        """
+        if np is None:
+            raise ImportError("BatchAES requires NumPy.")
+        if not isinstance(batch_blocks, int) or batch_blocks <= 0:
+            raise ValueError("batch_blocks must be a positive integer")
+        self.aes = aes
+        self.batch_blocks = batch_blocks
+        self.s_box = np.array(AES.s_box, dtype=np.uint8)
+        self.xtime = np.array([_xtime(x) & 0xFF for x in range(256)], dtype=np.uint8)
+        self.shift_rows = np.array(self.SHIFT_ROWS, dtype=np.intp)
+
+    def round_keys(self, key):
+        """
+        Return the cached encryption schedule as an (Nr + 1, 16) uint8 array.
+
+        Args:
+            key (bytes): The cipher key.
+
+        Returns:
+            numpy.ndarray: One row of round key bytes per round.
+        """
+        schedule, _ = self.aes.key_schedule(key)
+        return np.array(schedule, dtype='>u4').view(np.uint8).reshape(-1, 16)
+
+    def _mix_columns(self, state):
+        """Apply MixColumns to an (N, 16) state array in place."""
+        columns = state.reshape(-1, 4, 4)
+        a0, a1, a2, a3 = (columns[:, :, r].copy() for r in range(4))
+        total = a0 ^ a1 ^ a2 ^ a3
+        xtime = self.xtime
+        columns[:, :, 0] = a0 ^ total ^ xtime[a0 ^ a1]
+        columns[:, :, 1] = a1 ^ total ^ xtime[a1 ^ a2]
+        columns[:, :, 2] = a2 ^ total ^ xtime[a2 ^ a3]
+        columns[:, :, 3] = a3 ^ total ^ xtime[a3 ^ a0]
+
+    def encrypt_blocks(self, blocks, key):
+        """
+        Encrypt every row of an (N, 16) uint8 array.
+
+        Args:
+            blocks (numpy.ndarray): The plaintext blocks.
+            key (bytes): The cipher key.
+
+        Returns:
+            numpy.ndarray: The (N, 16) ciphertext blocks.
+        """
+        round_keys = self.round_keys(key)
+        Nr = len(round_keys) - 1
+        s_box, shift_rows = self.s_box, self.shift_rows
+        state = np.bitwise_xor(blocks, round_keys[0])
+        for round in range(1, Nr):
+            state = s_box[state][:, shift_rows]
+            self._mix_columns(state)
+            state ^= round_keys[round]
+        state = s_box[state][:, shift_rows]
+        state ^= round_keys[Nr]
+        return state
+
+    @staticmethod
+    def counter_blocks(counter, count):
+        """
+        Build ``count`` consecutive 128-bit big-endian counter blocks.
+
+        Args:
+            counter (int): The first counter value.
+            count (int): The number of blocks.
+
+        Returns:
+            numpy.ndarray: The (count, 16) uint8 counter blocks.
+        """
+        high = np.uint64(counter >> 64)
+        low = np.uint64(counter & 0xFFFFFFFFFFFFFFFF)
+        words = np.empty((count, 2), dtype='>u8')
+        lows = low + np.arange(count, dtype=np.uint64)  # wraps modulo 2^64
+        words[:, 0] = high + (lows < low).astype(np.uint64)
+        words[:, 1] = lows
+        return words.view(np.uint8).reshape(count, 16)
+
+    def encrypt_ctr(self, data, key, counter, out=None):
+        """
+        Encrypt or decrypt data of any length in CTR mode.
+
+        Produces the same output as ``AES.encrypt_ctr`` with the same counter block.
+
+        Args:
+            data (bytes | bytearray | memoryview): The data to process.
+            key (bytes): The cipher key.
+            counter (bytes): The 16-byte initial counter block.
+            out (bytearray | memoryview, optional): A writable buffer of at least
+                len(data) bytes to write into. A new bytearray is allocated if omitted.
+
+        Returns:
+            bytearray | memoryview: The output buffer.
+        """
+        src = _as_buffer(data, "data")
+        start = AES._check_iv(counter, "counter block")
+        if out is None:
+            out = bytearray(len(src))
+        elif len(out) < len(src):
+            raise ValueError("Output buffer is too small.")
+        source = np.frombuffer(src, dtype=np.uint8)
+        target = np.frombuffer(out, dtype=np.uint8)
+        step = self.batch_blocks * 16
+        for offset in range(0, len(source), step):
+            chunk = source[offset:offset + step]
+            blocks = -(-len(chunk) // 16)
+            counters = self.counter_blocks((start + offset // 16) & ((1 << 128) - 1), blocks)
+            keystream = self.encrypt_blocks(counters, key)
+            np.bitwise_xor(chunk, keystream.reshape(-1)[:len(chunk)], out=target[offset:offset + len(chunk)])
+        return out
+
+    decrypt_ctr = encrypt_ctr
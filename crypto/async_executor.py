@@ -0,0 +1,95 @@
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncExecutor:
+    """
+    Bounded executor that offloads blocking cryptographic work from an asyncio event loop.
+
+    Work runs on a worker pool so the event loop stays responsive. Two limits
+    provide backpressure: ``max_pending`` bounds how many jobs may be queued or
+    running at once, and ``max_key_derivations`` separately caps concurrent key
+    derivations, so a burst of slow PBKDF2 calls cannot occupy every worker.
+    Key derivations waiting on their cap do not count against ``max_pending``.
+    Callers beyond a limit wait in the event loop rather than piling up in the
+    pool. Cancelling an awaiting task withdraws its job if it has not started
+    yet; a job that is already running finishes and its result is discarded.
+
+    The limits apply per event loop, so one executor can serve several loops,
+    including successive ``asyncio.run`` calls. The default pool uses threads;
+    PBKDF2 holds the GIL, so pass a ``ProcessPoolExecutor`` to keep key
+    derivations from delaying the event loop. Jobs sent to a process pool
+    must be picklable, e.g. module-level functions with plain arguments.
+    """
+
+    def __init__(self, max_workers=None, max_pending=64, max_key_derivations=2, executor=None):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers (int, optional): The number of worker threads when no executor is given.
+            max_pending (int): The maximum number of jobs queued or running at once.
+            max_key_derivations (int): The maximum number of key derivations running at once.
+            executor (concurrent.futures.Executor, optional): An existing pool to run jobs on.
+
+        Raises:
+            ValueError: If a limit is not a positive integer.
+        """
+        if not isinstance(max_pending, int) or max_pending <= 0:
+            raise ValueError("max_pending must be a positive integer")
+        if not isinstance(max_key_derivations, int) or max_key_derivations <= 0:
+            raise ValueError("max_key_derivations must be a positive integer")
+        self.max_pending = max_pending
+        self.max_key_derivations = max_key_derivations
+        self._own_executor = executor is None
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_workers)
+        self._semaphores_by_loop = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphores(self):
+        """Return the semaphores for the running event loop, creating them on its first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores_by_loop.get(loop)
+            if semaphores is None:
+                semaphores = (asyncio.Semaphore(self.max_pending), asyncio.Semaphore(self.max_key_derivations))
+                self._semaphores_by_loop[loop] = semaphores
+        return semaphores
+
+    async def run(self, func, *args, key_derivation=False, **kwargs):
+        """
+        Run a blocking callable on the pool and await its result.
+
+        Args:
+            func (callable): The blocking function to run.
+            *args: Positional arguments for func.
+            key_derivation (bool): Whether the job counts against the key derivation cap.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            The return value of func.
+        """
+        pending, key_derivations = self._semaphores()
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        if key_derivation:
+            # Wait for the derivation cap before taking a pending slot, so queued
+            # derivations do not hold slots that cheaper jobs could use.
+            async with key_derivations:
+                async with pending:
+                    return await loop.run_in_executor(self.executor, call)
+        async with pending:
+            return await loop.run_in_executor(self.executor, call)
+
+    def shutdown(self, wait=True):
+        """
+        Shut down the worker pool if this executor created it.
+
+        Args:
+            wait (bool): Whether to wait for running jobs to finish.
+        """
+        if self._own_executor:
+            self.executor.shutdown(wait=wait)
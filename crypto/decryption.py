@@ -1,19 +1,76 @@
 from group_theory.galois_field import GaloisField
 from crypto.aes import AES
 import hmac
-from crypto.pbkdf2 import pbkdf2_hmac
+import mmap
+import os
+from crypto.async_executor import AsyncExecutor
+from crypto.encryption import _process_aes
+from crypto.pbkdf2 import DerivedKeyCache, pbkdf2_hmac
+from crypto.streaming import read_into
+
+
+def _decrypt_message(ciphertext, key, mac, aes=None):
+    """
+    Verify and decrypt one message as ``Decryption.decrypt`` does.
+
+    This is a module-level function so that ``decrypt_async`` can run it on any
+    executor, including a process pool.
+
+    Args:
+        ciphertext (bytes): The ciphertext to decrypt, prefixed with its 16-byte initial counter block.
+        key (bytes): The decryption key.
+        mac (bytes): The message authentication code for integrity check.
+        aes (AES, optional): The cipher to use; the process's shared instance if omitted.
+
+    Returns:
+        str: The decrypted plaintext.
+    """
+    if not isinstance(ciphertext, bytes):
+        raise ValueError("Invalid input type for ciphertext. Expected bytes.")
+    if not isinstance(key, bytes):
+        raise ValueError("Invalid input type for key. Expected bytes.")
+    if not isinstance(mac, bytes):
+        raise ValueError("Invalid input type for mac. Expected bytes.")
+    if len(key) != 32:
+        raise ValueError("Invalid key length. Key must be 32 bytes long.")
+    if len(ciphertext) < 16:
+        raise ValueError("Invalid ciphertext length. Missing the initial counter block.")
+
+    # Verify the integrity of the ciphertext using MAC
+    computed_mac = hmac.new(key, ciphertext, 'sha256').digest()
+    if not hmac.compare_digest(computed_mac, mac):
+        raise ValueError("MAC verification failed. The ciphertext may have been tampered with.")
+
+    view = memoryview(ciphertext)
+    plaintext_bytes = (aes or _process_aes()).decrypt_ctr(view[16:], key, view[:16])
+    plaintext = plaintext_bytes.decode('utf-8')
+
+    # Securely erase plaintext bytes from memory
+    del plaintext_bytes
+
+    return plaintext
+
 
 class Decryption:
     """Represents decryption algorithms using Galois fields."""
     
-    def __init__(self, galois_field: GaloisField):
+    def __init__(self, galois_field: GaloisField, async_executor: AsyncExecutor = None,
+                 key_cache: DerivedKeyCache = None):
         """
         Initialize the decryption with a Galois field.
 
         Args:
             galois_field (GaloisField): The Galois field for cryptographic operations.
+            async_executor (AsyncExecutor, optional): The executor used by the ``*_async``
+                methods. One is created on first use if omitted; pass the same instance
+                to several objects to share its limits.
+            key_cache (DerivedKeyCache, optional): An opt-in cache for ``generate_key``;
+                repeated derivations for the same password and salt are then served
+                from memory. Pass the same instance to share it.
         """
         self.galois_field = galois_field
+        self.async_executor = async_executor
+        self.key_cache = key_cache
         self.aes = AES(galois_field.elements, galois_field.addition, galois_field.multiplication)
 
     def generate_key(self, password: bytes, salt: bytes) -> bytes:
@@ -27,6 +84,8 @@ class Decryption:
         Returns:
             bytes: The generated key.
         """
+        if self.key_cache is not None:
+            return self.key_cache.derive('sha256', password, salt, 100000, 32)
         return pbkdf2_hmac('sha256', password, salt, 100000, 32)
 
     def decrypt(self, ciphertext: bytes, key: bytes, mac: bytes) -> str:
@@ -34,7 +93,7 @@ class Decryption:
         Decrypt the ciphertext using the provided key and verify the integrity using MAC.
 
         Args:
-            ciphertext (bytes): The ciphertext to decrypt.
+            ciphertext (bytes): The ciphertext to decrypt, prefixed with its 16-byte initial counter block.
             key (bytes): The decryption key.
             mac (bytes): The message authentication code for integrity check.
 
@@ -44,24 +103,154 @@ class Decryption:
         Raises:
             ValueError: If the input types are invalid or the MAC verification fails.
         """
-        if not isinstance(ciphertext, bytes):
-            raise ValueError("Invalid input type for ciphertext. Expected bytes.")
+        return _decrypt_message(ciphertext, key, mac, self.aes)
+
+    def decrypt_stream(self, reader, writer, key: bytes, mac: bytes, chunk_size: int = 65536) -> None:
+        """
+        Decrypt a binary stream produced by ``Encryption.encrypt_stream`` chunk by chunk.
+
+        Plaintext is written as it is decrypted, holding only two reusable chunk
+        buffers in memory, while the MAC is updated incrementally. The MAC can only
+        be checked once the whole stream has been read, so on failure the data
+        already written must be discarded by the caller.
+
+        Args:
+            reader: A blocking binary file-like object to read the ciphertext from.
+            writer: A binary file-like object to write the plaintext to.
+            key (bytes): The decryption key.
+            mac (bytes): The message authentication code for integrity check.
+            chunk_size (int): The number of bytes processed per chunk; a multiple of 16.
+
+        Raises:
+            ValueError: If the inputs are invalid or the MAC verification fails.
+            BlockingIOError: If the reader is non-blocking and has no data available.
+        """
         if not isinstance(key, bytes):
             raise ValueError("Invalid input type for key. Expected bytes.")
         if not isinstance(mac, bytes):
             raise ValueError("Invalid input type for mac. Expected bytes.")
         if len(key) != 32:
             raise ValueError("Invalid key length. Key must be 32 bytes long.")
-        
-        # Verify the integrity of the ciphertext using MAC
-        computed_mac = hmac.new(key, ciphertext, 'sha256').digest()
-        if not hmac.compare_digest(computed_mac, mac):
-            raise ValueError("MAC verification failed. The ciphertext may have been tampered with.")
-        
-        plaintext_bytes = self.aes.decrypt(list(ciphertext), list(key))
-        plaintext = bytes(plaintext_bytes).decode('utf-8')
-        
+        if not isinstance(chunk_size, int) or chunk_size <= 0 or chunk_size % 16:
+            raise ValueError("chunk_size must be a positive multiple of 16.")
+
+        counter = bytearray(16)
+        if read_into(reader, memoryview(counter)) != 16:
+            raise ValueError("Invalid ciphertext length. Missing the initial counter block.")
+        position = int.from_bytes(counter, 'big')
+        computed_mac = hmac.new(key, counter, 'sha256')
+
+        out_buffer = bytearray(chunk_size)
+        in_view, out_view = memoryview(bytearray(chunk_size)), memoryview(out_buffer)
+        while True:
+            n = read_into(reader, in_view)
+            if n:
+                computed_mac.update(in_view[:n])
+                self.aes.decrypt_ctr(in_view[:n], key, position.to_bytes(16, 'big'), out=out_view)
+                position = (position + n // 16) & ((1 << 128) - 1)
+                writer.write(out_view[:n])
+            if n < chunk_size:
+                break
+
         # Securely erase plaintext bytes from memory
-        del plaintext_bytes
-        
-        return plaintext
+        out_buffer[:] = bytes(chunk_size)
+
+        if not hmac.compare_digest(computed_mac.digest(), mac):
+            raise ValueError("MAC verification failed. The ciphertext may have been tampered with.")
+
+    def decrypt_file(self, path_in, path_out, key: bytes, mac: bytes, chunk_size: int = 1 << 20) -> None:
+        """
+        Decrypt a file produced by ``Encryption.encrypt_file`` through memory maps.
+
+        The whole mapped input is authenticated before any plaintext is written,
+        then decrypted straight into a mapped output file through memoryview
+        slices of both maps.
+
+        Args:
+            path_in (str | os.PathLike): The encrypted file.
+            path_out (str | os.PathLike): The file to write; it is created or truncated.
+            key (bytes): The decryption key.
+            mac (bytes): The message authentication code for integrity check.
+            chunk_size (int): The number of bytes decrypted per step; a multiple of 16.
+
+        Raises:
+            ValueError: If the inputs are invalid or the MAC verification fails.
+        """
+        if not isinstance(key, bytes):
+            raise ValueError("Invalid input type for key. Expected bytes.")
+        if not isinstance(mac, bytes):
+            raise ValueError("Invalid input type for mac. Expected bytes.")
+        if len(key) != 32:
+            raise ValueError("Invalid key length. Key must be 32 bytes long.")
+        if not isinstance(chunk_size, int) or chunk_size <= 0 or chunk_size % 16:
+            raise ValueError("chunk_size must be a positive multiple of 16.")
+
+        with open(path_in, 'rb') as source:
+            size = os.fstat(source.fileno()).st_size
+            if size < 16:
+                raise ValueError("Invalid ciphertext length. Missing the initial counter block.")
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as src_map, memoryview(src_map) as src:
+                # Verify the integrity of the ciphertext using MAC
+                computed_mac = hmac.new(key, src, 'sha256').digest()
+                if not hmac.compare_digest(computed_mac, mac):
+                    raise ValueError("MAC verification failed. The ciphertext may have been tampered with.")
+
+                position = int.from_bytes(src[:16], 'big')
+                with open(path_out, 'w+b') as target:
+                    if size == 16:
+                        return
+                    target.truncate(size - 16)
+                    with mmap.mmap(target.fileno(), size - 16) as dst_map, memoryview(dst_map) as dst:
+                        for offset in range(0, size - 16, chunk_size):
+                            end = min(offset + chunk_size, size - 16)
+                            out = dst[offset:end]
+                            self.aes.decrypt_ctr(src[16 + offset:16 + end], key, position.to_bytes(16, 'big'),
+                                                 out=out)
+                            position = (position + (end - offset) // 16) & ((1 << 128) - 1)
+                            out.release()
+                        dst_map.flush()
+
+    def _executor(self) -> AsyncExecutor:
+        """Return the async executor, creating a default one on first use."""
+        if self.async_executor is None:
+            self.async_executor = AsyncExecutor()
+        return self.async_executor
+
+    async def generate_key_async(self, password: bytes, salt: bytes) -> bytes:
+        """
+        Generate a key like ``generate_key`` without blocking the event loop.
+
+        The key cache, if any, is consulted in the calling thread; on a miss the
+        derivation runs on the async executor as a plain ``pbkdf2_hmac`` call, so
+        it also works on a process pool, and counts against the executor's cap
+        on concurrent key derivations.
+
+        Args:
+            password (bytes): The password to derive the key from.
+            salt (bytes): The salt to use in the key derivation.
+
+        Returns:
+            bytes: The generated key.
+        """
+        if self.key_cache is not None:
+            key = self.key_cache.lookup('sha256', password, salt, 100000, 32)
+            if key is not None:
+                return key
+        key = await self._executor().run(pbkdf2_hmac, 'sha256', password, salt, 100000, 32, key_derivation=True)
+        if self.key_cache is not None:
+            self.key_cache.store('sha256', password, salt, 100000, 32, key)
+        return key
+
+    async def decrypt_async(self, ciphertext: bytes, key: bytes, mac: bytes):
+        """
+        Decrypt like ``decrypt`` without blocking the event loop.
+
+        Args:
+            ciphertext (bytes): The ciphertext to decrypt.
+            key (bytes): The decryption key.
+            mac (bytes): The message authentication code for integrity check.
+
+        Returns:
+            str: The decrypted plaintext.
+        """
+        return await self._executor().run(_decrypt_message, ciphertext, key, mac)
@@ -1,3 +1,4 @@
+from crypto.des_impl import DESImpl
 from group_theory.galois_field import GaloisField
 
 class DES:
@@ -1,3 +1,4 @@
+from crypto.number_theory import simultaneous_exponentiation
 from group_theory.galois_field import GaloisField
 
 class ECC(GaloisField):
@@ -88,6 +89,25 @@ class ECC(GaloisField):
             k >>= 1
         return R
 
+    def double_scalar_multiplication(self, k1, P, k2, Q):
+        """
+        Compute k1 * P + k2 * Q with one shared chain of doublings (Shamir's trick).
+
+        This is the core of ECDSA-style verification, u1 * G + u2 * Q, and costs
+        about as much as a single scalar multiplication.
+
+        Args:
+            k1 (int): The scalar for P.
+            P (tuple): The first point (x, y).
+            k2 (int): The scalar for Q.
+            Q (tuple): The second point (x, y).
+
+        Returns:
+            tuple: The resulting point (x', y').
+        """
+        R = simultaneous_exponentiation(P, k1, Q, k2, self.point_addition, self.point_doubling)
+        return (0, 0) if R is None else R
+
     def generate_keys(self):
         """
         Generate a pair of private and public keys for ECC.
@@ -1,19 +1,92 @@
 from group_theory.galois_field import GaloisField
-from crypto.aes import AES
+from crypto.aes import AES, _as_buffer
+from crypto.aes_batch import BatchAES
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 import hmac
-from crypto.pbkdf2 import pbkdf2_hmac
+import mmap
+import operator
+import os
+from crypto.async_executor import AsyncExecutor
+from crypto.pbkdf2 import DerivedKeyCache, pbkdf2_hmac
+from crypto.streaming import read_into
+
+_worker_aes = None
+
+
+def _process_aes():
+    """
+    Return this process's shared AES instance over GF(2), building it on first use.
+
+    Work submitted to a process pool uses it, so only plain arguments cross the
+    process boundary, never an ``Encryption`` object with its locks and field
+    operations.
+    """
+    global _worker_aes
+    if _worker_aes is None:
+        _worker_aes = AES({0, 1}, operator.xor, operator.and_)
+    return _worker_aes
+
+
+def _ctr_segment(key, counter, data):
+    """Encrypt one counter-aligned CTR segment inside a worker process."""
+    return bytes(_process_aes().encrypt_ctr(data, key, counter))
+
+
+def _encrypt_message(plaintext, key, aes=None):
+    """
+    Encrypt one message as ``Encryption.encrypt`` does.
+
+    This is a module-level function so that ``encrypt_async`` can run it on any
+    executor, including a process pool.
+
+    Args:
+        plaintext (str): The plaintext to encrypt.
+        key (bytes): The encryption key.
+        aes (AES, optional): The cipher to use; the process's shared instance if omitted.
+
+    Returns:
+        tuple: The encrypted ciphertext and the message authentication code (MAC).
+    """
+    if not isinstance(plaintext, str) or not isinstance(key, bytes):
+        raise ValueError("Invalid input types for plaintext or key.")
+    if len(key) != 32:
+        raise ValueError("Invalid key length. Key must be 32 bytes long.")
+
+    plaintext_bytes = plaintext.encode('utf-8')
+    counter = os.urandom(16)
+    buffer = bytearray(16 + len(plaintext_bytes))
+    buffer[:16] = counter
+    (aes or _process_aes()).encrypt_ctr(plaintext_bytes, key, counter, out=memoryview(buffer)[16:])
+    ciphertext = bytes(buffer)
+
+    # Generate MAC for integrity check
+    mac = hmac.new(key, ciphertext, 'sha256').digest()
+
+    # Securely erase plaintext bytes from memory
+    del plaintext_bytes
+
+    return ciphertext, mac
 
 class Encryption:
     """Represents encryption algorithms using Galois fields."""
     
-    def __init__(self, galois_field: GaloisField):
+    def __init__(self, galois_field: GaloisField, async_executor: AsyncExecutor = None,
+                 key_cache: DerivedKeyCache = None):
         """
         Initialize the encryption with a Galois field.
 
         Args:
             galois_field (GaloisField): The Galois field for cryptographic operations.
+            async_executor (AsyncExecutor, optional): The executor used by the ``*_async``
+                methods. One is created on first use if omitted; pass the same instance
+                to several objects to share its limits.
+            key_cache (DerivedKeyCache, optional): An opt-in cache for ``generate_key``;
+                repeated derivations for the same password and salt are then served
+                from memory. Pass the same instance to share it.
         """
         self.galois_field = galois_field
+        self.async_executor = async_executor
+        self.key_cache = key_cache
         self.aes = AES(galois_field.elements, galois_field.addition, galois_field.multiplication)
 
     def generate_key(self, password: bytes, salt: bytes) -> bytes:
@@ -27,12 +100,17 @@ class Encryption:
         Returns:
             bytes: The generated key.
         """
+        if self.key_cache is not None:
+            return self.key_cache.derive('sha256', password, salt, 100000, 32)
         return pbkdf2_hmac('sha256', password, salt, 100000, 32)
 
     def encrypt(self, plaintext: str, key: bytes) -> (bytes, bytes):
         """
         Encrypt the plaintext using the provided key and generate a MAC for integrity check.
 
+        The plaintext is encrypted with AES-256 in CTR mode under a random 16-byte
+        initial counter block, which is prepended to the returned ciphertext.
+
         Args:
             plaintext (str): The plaintext to encrypt.
             key (bytes): The encryption key.
@@ -43,18 +121,238 @@ class Encryption:
         Raises:
             ValueError: If the input types are invalid or the key length is incorrect.
         """
-        if not isinstance(plaintext, str) or not isinstance(key, bytes):
-            raise ValueError("Invalid input types for plaintext or key.")
+        return _encrypt_message(plaintext, key, self.aes)
+
+    def encrypt_stream(self, reader, writer, key: bytes, chunk_size: int = 65536) -> bytes:
+        """
+        Encrypt a binary stream chunk by chunk and return its MAC.
+
+        The 16-byte initial counter block is written first, followed by the
+        ciphertext; the output is the same as ``encrypt`` would produce for the
+        whole stream. Only two reusable chunk buffers are held in memory, and the
+        MAC is updated incrementally as each chunk is written.
+
+        Args:
+            reader: A blocking binary file-like object to read the plaintext from.
+            writer: A binary file-like object to write the ciphertext to.
+            key (bytes): The encryption key.
+            chunk_size (int): The number of bytes processed per chunk; a multiple of 16.
+
+        Returns:
+            bytes: The message authentication code (MAC) over the written data.
+
+        Raises:
+            ValueError: If the key or chunk size is invalid.
+            BlockingIOError: If the reader is non-blocking and has no data available.
+        """
+        if not isinstance(key, bytes):
+            raise ValueError("Invalid input type for key. Expected bytes.")
         if len(key) != 32:
             raise ValueError("Invalid key length. Key must be 32 bytes long.")
-        
-        plaintext_bytes = plaintext.encode('utf-8')
-        ciphertext = bytes(self.aes.encrypt(list(plaintext_bytes), list(key)))
-        
-        # Generate MAC for integrity check
-        mac = hmac.new(key, ciphertext, 'sha256').digest()
-        
+        if not isinstance(chunk_size, int) or chunk_size <= 0 or chunk_size % 16:
+            raise ValueError("chunk_size must be a positive multiple of 16.")
+
+        counter = os.urandom(16)
+        position = int.from_bytes(counter, 'big')
+        mac = hmac.new(key, counter, 'sha256')
+        writer.write(counter)
+
+        in_buffer = bytearray(chunk_size)
+        in_view, out_view = memoryview(in_buffer), memoryview(bytearray(chunk_size))
+        while True:
+            n = read_into(reader, in_view)
+            if n:
+                self.aes.encrypt_ctr(in_view[:n], key, position.to_bytes(16, 'big'), out=out_view)
+                position = (position + n // 16) & ((1 << 128) - 1)
+                mac.update(out_view[:n])
+                writer.write(out_view[:n])
+            if n < chunk_size:
+                break
+
         # Securely erase plaintext bytes from memory
-        del plaintext_bytes
-        
+        in_buffer[:] = bytes(chunk_size)
+
+        return mac.digest()
+
+    def encrypt_file(self, path_in, path_out, key: bytes, chunk_size: int = 1 << 20) -> bytes:
+        """
+        Encrypt a file into another file through memory maps and return the MAC.
+
+        The input is mapped read-only and the ciphertext is written straight into
+        a mapped output file of the final size, through memoryview slices of both
+        maps. The MAC is computed over the same output views, so file data is
+        never copied into intermediate Python objects. The output format is the
+        same as ``encrypt_stream``.
+
+        Args:
+            path_in (str | os.PathLike): The file to encrypt.
+            path_out (str | os.PathLike): The file to write; it is created or truncated.
+            key (bytes): The encryption key.
+            chunk_size (int): The number of bytes encrypted and MACed per step; a multiple of 16.
+
+        Returns:
+            bytes: The message authentication code (MAC) over the written file.
+
+        Raises:
+            ValueError: If the key or chunk size is invalid.
+        """
+        if not isinstance(key, bytes):
+            raise ValueError("Invalid input type for key. Expected bytes.")
+        if len(key) != 32:
+            raise ValueError("Invalid key length. Key must be 32 bytes long.")
+        if not isinstance(chunk_size, int) or chunk_size <= 0 or chunk_size % 16:
+            raise ValueError("chunk_size must be a positive multiple of 16.")
+
+        counter = os.urandom(16)
+        position = int.from_bytes(counter, 'big')
+        mac = hmac.new(key, counter, 'sha256')
+        with open(path_in, 'rb') as source, open(path_out, 'w+b') as target:
+            size = os.fstat(source.fileno()).st_size
+            if size == 0:
+                target.write(counter)
+                return mac.digest()
+            target.truncate(16 + size)
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as src_map, \
+                    mmap.mmap(target.fileno(), 16 + size) as dst_map:
+                with memoryview(src_map) as src, memoryview(dst_map) as dst:
+                    dst[:16] = counter
+                    for offset in range(0, size, chunk_size):
+                        end = min(offset + chunk_size, size)
+                        out = dst[16 + offset:16 + end]
+                        self.aes.encrypt_ctr(src[offset:end], key, position.to_bytes(16, 'big'), out=out)
+                        position = (position + (end - offset) // 16) & ((1 << 128) - 1)
+                        mac.update(out)
+                        out.release()
+                dst_map.flush()
+        return mac.digest()
+
+    def encrypt_parallel(self, data, key: bytes, workers: int = None, backend: str = 'python',
+                         segment_size: int = 1 << 20, executor=None) -> (bytes, bytes):
+        """
+        Encrypt a large buffer in CTR mode across several CPU cores.
+
+        The buffer is split into counter-aligned segments that are encrypted
+        independently and reassembled into one output buffer. With the 'python'
+        backend segments go to a process pool, at most two per worker at a time,
+        and each result is written out as it completes; with the 'numpy' backend
+        they are encrypted by ``BatchAES`` on a thread pool, since NumPy releases
+        the GIL, writing straight into the shared output. The result has the same format
+        as ``encrypt`` and ``encrypt_stream``.
+
+        Args:
+            data (bytes | bytearray | memoryview): The plaintext to encrypt.
+            key (bytes): The encryption key.
+            workers (int, optional): The number of workers, also used to bound the segments
+                in flight on a given executor; defaults to the CPU count.
+            backend (str): 'python' for a process pool or 'numpy' for a thread pool.
+            segment_size (int): The number of bytes per dispatched segment; a multiple of 16.
+            executor (concurrent.futures.Executor, optional): An existing pool to reuse
+                instead of starting one for this call.
+
+        Returns:
+            tuple: The encrypted ciphertext and the message authentication code (MAC).
+
+        Raises:
+            ValueError: If the inputs are invalid.
+        """
+        if not isinstance(key, bytes):
+            raise ValueError("Invalid input type for key. Expected bytes.")
+        if len(key) != 32:
+            raise ValueError("Invalid key length. Key must be 32 bytes long.")
+        if backend not in ('python', 'numpy'):
+            raise ValueError("backend must be 'python' or 'numpy'.")
+        if not isinstance(segment_size, int) or segment_size <= 0 or segment_size % 16:
+            raise ValueError("segment_size must be a positive multiple of 16.")
+        src = _as_buffer(data, "data")
+
+        counter = os.urandom(16)
+        start = int.from_bytes(counter, 'big')
+        buffer = bytearray(16 + len(src))
+        buffer[:16] = counter
+        out = memoryview(buffer)[16:]
+        segments = [(offset, min(offset + segment_size, len(src))) for offset in range(0, len(src), segment_size)]
+
+        def segment_counter(offset):
+            return ((start + offset // 16) & ((1 << 128) - 1)).to_bytes(16, 'big')
+
+        workers = workers or os.cpu_count() or 1
+        own_executor = executor is None
+        if own_executor:
+            pool_class = ThreadPoolExecutor if backend == 'numpy' else ProcessPoolExecutor
+            executor = pool_class(max_workers=workers)
+        in_flight = {}
+        try:
+            if backend == 'numpy':
+                batch = BatchAES(self.aes)
+                futures = [executor.submit(batch.encrypt_ctr, src[begin:end], key, segment_counter(begin),
+                                           out[begin:end])
+                           for begin, end in segments]
+                for future in futures:
+                    future.result()
+            else:
+                # Bound the segment copies waiting in the pool to 2 * workers
+                for begin, end in segments:
+                    if len(in_flight) >= 2 * workers:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            done_begin, done_end = in_flight.pop(future)
+                            out[done_begin:done_end] = future.result()
+                    future = executor.submit(_ctr_segment, key, segment_counter(begin), bytes(src[begin:end]))
+                    in_flight[future] = (begin, end)
+                while in_flight:
+                    future, (begin, end) = in_flight.popitem()
+                    out[begin:end] = future.result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if own_executor:
+                executor.shutdown()
+        out.release()
+
+        ciphertext = bytes(buffer)
+        mac = hmac.new(key, ciphertext, 'sha256').digest()
         return ciphertext, mac
+
+    def _executor(self) -> AsyncExecutor:
+        """Return the async executor, creating a default one on first use."""
+        if self.async_executor is None:
+            self.async_executor = AsyncExecutor()
+        return self.async_executor
+
+    async def generate_key_async(self, password: bytes, salt: bytes) -> bytes:
+        """
+        Generate a key like ``generate_key`` without blocking the event loop.
+
+        The key cache, if any, is consulted in the calling thread; on a miss the
+        derivation runs on the async executor as a plain ``pbkdf2_hmac`` call, so
+        it also works on a process pool, and counts against the executor's cap
+        on concurrent key derivations.
+
+        Args:
+            password (bytes): The password to derive the key from.
+            salt (bytes): The salt to use in the key derivation.
+
+        Returns:
+            bytes: The generated key.
+        """
+        if self.key_cache is not None:
+            key = self.key_cache.lookup('sha256', password, salt, 100000, 32)
+            if key is not None:
+                return key
+        key = await self._executor().run(pbkdf2_hmac, 'sha256', password, salt, 100000, 32, key_derivation=True)
+        if self.key_cache is not None:
+            self.key_cache.store('sha256', password, salt, 100000, 32, key)
+        return key
+
+    async def encrypt_async(self, plaintext: str, key: bytes):
+        """
+        Encrypt like ``encrypt`` without blocking the event loop.
+
+        Args:
+            plaintext (str): The plaintext to encrypt.
+            key (bytes): The encryption key.
+
+        Returns:
+            tuple: The encrypted ciphertext and the message authentication code (MAC).
+        """
+        return await self._executor().run(_encrypt_message, plaintext, key)
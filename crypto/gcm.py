@@ -0,0 +1,200 @@
+import hmac
+
+from crypto.aes import KeyScheduleCache, _as_buffer, _BLOCK
+from group_theory.gf128 import gf128_tables
+
+
+class GCM:
+    """
+    Represents AES in Galois/Counter Mode (NIST SP 800-38D).
+
+    Encryption and authentication run as a single pass: each block is
+    CTR-encrypted with the AES T-table core and immediately folded into GHASH.
+    GHASH multiplies by the hash subkey H through precomputed 8-bit tables,
+    which are cached per key next to the AES key schedules.
+    """
+
+    tag_size = 16
+
+    def __init__(self, aes, cache_size=64):
+        """
+        Initialize GCM on top of an AES instance.
+
+        Args:
+            aes (AES): The block cipher whose key schedule cache is reused.
+            cache_size (int): The number of keys whose GHASH tables are kept cached.
+        """
+        self.aes = aes
+        self.hash_key_cache = KeyScheduleCache(cache_size)
+
+    def _hash_tables(self, key, schedule):
+        """Return the cached GHASH multiplication tables for a key."""
+        def expand(_):
+            h0, h1, h2, h3 = self.aes._encrypt_words(0, 0, 0, 0, schedule, self.aes._rounds(schedule))
+            # Cached tables are shared between callers, so make them immutable
+            return tuple(tuple(table) for table in gf128_tables((h0 << 96) | (h1 << 64) | (h2 << 32) | h3))
+        return self.hash_key_cache.get(key, expand)
+
+    @staticmethod
+    def _ghash(tables, y, data):
+        """
+        Fold data, zero-padded to a whole number of blocks, into the GHASH state y.
+
+        Args:
+            tables (tuple): The GHASH multiplication tables for H.
+            y (int): The current GHASH state.
+            data (memoryview): The data to absorb.
+
+        Returns:
+            int: The updated GHASH state.
+        """
+        full = len(data) - len(data) % 16
+        for offset in range(0, full, 16):
+            y = int.from_bytes(data[offset:offset + 16], 'big') ^ y
+            z = 0
+            for table, byte in zip(tables, y.to_bytes(16, 'big')):
+                z ^= table[byte]
+            y = z
+        if full < len(data):
+            y = int.from_bytes(bytes(data[full:]) + bytes(16 - len(data) + full), 'big') ^ y
+            z = 0
+            for table, byte in zip(tables, y.to_bytes(16, 'big')):
+                z ^= table[byte]
+            y = z
+        return y
+
+    def _pre_counter(self, tables, iv):
+        """
+        Derive the pre-counter block J0 from the IV.
+
+        Args:
+            tables (tuple): The GHASH multiplication tables for H.
+            iv (bytes): The initialization vector; 12 bytes is recommended.
+
+        Returns:
+            int: The 128-bit block J0.
+        """
+        if len(iv) == 12:
+            return (int.from_bytes(iv, 'big') << 32) | 1
+        y = self._ghash(tables, 0, memoryview(iv))
+        return self._ghash(tables, y, memoryview((8 * len(iv)).to_bytes(16, 'big')))
+
+    def _crypt(self, src, dst, schedule, tables, j0, y, decrypt):
+        """
+        CTR-encrypt or decrypt src into dst while absorbing the ciphertext into GHASH.
+
+        Args:
+            src (memoryview): The input data.
+            dst (bytearray | memoryview): The writable output, at least as long as src.
+            schedule (list): The AES encryption key schedule.
+            tables (tuple): The GHASH multiplication tables for H.
+            j0 (int): The pre-counter block; counting starts at inc32(J0).
+            y (int): The GHASH state after the additional authenticated data.
+            decrypt (bool): Whether src is ciphertext (hashed before decryption).
+
+        Returns:
+            int: The GHASH state after the data.
+        """
+        Nr = self.aes._rounds(schedule)
+        encrypt_words = self.aes._encrypt_words
+        unpack_from, pack_into = _BLOCK.unpack_from, _BLOCK.pack_into
+        c0, c1, c2, c3 = j0 >> 96, (j0 >> 64) & 0xFFFFFFFF, (j0 >> 32) & 0xFFFFFFFF, j0 & 0xFFFFFFFF
+        full = len(src) - len(src) % 16
+        for offset in range(0, full, 16):
+            c3 = (c3 + 1) & 0xFFFFFFFF
+            k0, k1, k2, k3 = encrypt_words(c0, c1, c2, c3, schedule, Nr)
+            x0, x1, x2, x3 = unpack_from(src, offset)
+            o0, o1, o2, o3 = x0 ^ k0, x1 ^ k1, x2 ^ k2, x3 ^ k3
+            pack_into(dst, offset, o0, o1, o2, o3)
+            if decrypt:
+                y ^= (x0 << 96) | (x1 << 64) | (x2 << 32) | x3
+            else:
+                y ^= (o0 << 96) | (o1 << 64) | (o2 << 32) | o3
+            z = 0
+            for table, byte in zip(tables, y.to_bytes(16, 'big')):
+                z ^= table[byte]
+            y = z
+        if full < len(src):
+            c3 = (c3 + 1) & 0xFFFFFFFF
+            keystream = _BLOCK.pack(*encrypt_words(c0, c1, c2, c3, schedule, Nr))
+            for i in range(len(src) - full):
+                dst[full + i] = src[full + i] ^ keystream[i]
+            y = self._ghash(tables, y, (src if decrypt else memoryview(dst))[full:len(src)])
+        return y
+
+    def _tag(self, schedule, tables, j0, y, aad_length, data_length):
+        """Finish GHASH with the length block and encrypt it under J0 to form the tag."""
+        y = self._ghash(tables, y, memoryview(((8 * aad_length) << 64 | (8 * data_length)).to_bytes(16, 'big')))
+        s0, s1, s2, s3 = self.aes._encrypt_words(j0 >> 96, (j0 >> 64) & 0xFFFFFFFF, (j0 >> 32) & 0xFFFFFFFF,
+                                                 j0 & 0xFFFFFFFF, schedule, self.aes._rounds(schedule))
+        return (((s0 << 96) | (s1 << 64) | (s2 << 32) | s3) ^ y).to_bytes(16, 'big')
+
+    def _setup(self, key, iv, aad):
+        """Validate the key and IV and return the schedule, GHASH tables, J0 and post-AAD state."""
+        if not isinstance(iv, (bytes, bytearray, memoryview)) or len(iv) == 0:
+            raise ValueError("Invalid IV. It must be a non-empty bytes value.")
+        schedule, _ = self.aes.key_schedule(key)
+        key = bytes(key)
+        tables = self._hash_tables(key, schedule)
+        j0 = self._pre_counter(tables, bytes(iv))
+        return schedule, tables, j0, self._ghash(tables, 0, aad)
+
+    def encrypt(self, plaintext, key, iv, aad=b"", out=None):
+        """
+        Encrypt and authenticate data in a single pass.
+
+        Args:
+            plaintext (bytes | bytearray | memoryview): The data to encrypt.
+            key (bytes): The 16, 24 or 32-byte AES key.
+            iv (bytes): The initialization vector; use a unique 12-byte value per message.
+            aad (bytes, optional): Additional data that is authenticated but not encrypted.
+            out (bytearray | memoryview, optional): A writable buffer of at least
+                len(plaintext) bytes for the ciphertext.
+
+        Returns:
+            tuple: The ciphertext buffer and the 16-byte authentication tag.
+        """
+        src = _as_buffer(plaintext, "plaintext")
+        aad = _as_buffer(aad, "aad")
+        if out is None:
+            out = bytearray(len(src))
+        elif len(out) < len(src):
+            raise ValueError("Output buffer is too small.")
+        schedule, tables, j0, y = self._setup(key, iv, aad)
+        y = self._crypt(src, out, schedule, tables, j0, y, decrypt=False)
+        return out, self._tag(schedule, tables, j0, y, len(aad), len(src))
+
+    def decrypt(self, ciphertext, key, iv, tag, aad=b"", out=None):
+        """
+        Decrypt data in a single pass and verify its authentication tag.
+
+        Args:
+            ciphertext (bytes | bytearray | memoryview): The data to decrypt.
+            key (bytes): The 16, 24 or 32-byte AES key.
+            iv (bytes): The initialization vector used for encryption.
+            tag (bytes): The authentication tag to verify.
+            aad (bytes, optional): The additional authenticated data.
+            out (bytearray | memoryview, optional): A writable buffer of at least
+                len(ciphertext) bytes for the plaintext.
+
+        Returns:
+            bytearray | memoryview: The plaintext buffer.
+
+        Raises:
+            ValueError: If the tag does not match. The output buffer is zeroed.
+        """
+        src = _as_buffer(ciphertext, "ciphertext")
+        aad = _as_buffer(aad, "aad")
+        if not isinstance(tag, (bytes, bytearray, memoryview)):
+            raise ValueError("Invalid input type for tag. Expected bytes.")
+        if out is None:
+            out = bytearray(len(src))
+        elif len(out) < len(src):
+            raise ValueError("Output buffer is too small.")
+        schedule, tables, j0, y = self._setup(key, iv, aad)
+        y = self._crypt(src, out, schedule, tables, j0, y, decrypt=True)
+        if not hmac.compare_digest(self._tag(schedule, tables, j0, y, len(aad), len(src)), bytes(tag)):
+            out[:len(src)] = bytes(len(src))
+            raise ValueError("Authentication tag verification failed. The ciphertext may have been tampered with.")
+        return out
+
@@ -1,25 +1,92 @@
-def is_prime(n):
+import functools
+import math
+import secrets
+
+
+def small_primes(limit):
+    """
+    List the primes below a limit with the sieve of Eratosthenes.
+
+    Args:
+        limit (int): The exclusive upper bound.
+
+    Returns:
+        list: The primes p with 2 <= p < limit, in increasing order.
+    """
+    if limit <= 2:
+        return []
+    sieve = bytearray([1]) * limit
+    sieve[0] = sieve[1] = 0
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return [i for i, flag in enumerate(sieve) if flag]
+
+
+# Trial division by these primes rejects most composites before Miller-Rabin
+_SIEVE_PRIMES = small_primes(1000)
+_SIEVE_PRODUCT = math.prod(_SIEVE_PRIMES)
+# Testing against these bases is deterministic for every n < 3.3 * 10^24 > 2^64
+_DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def _miller_rabin(n, d, s, a):
+    """
+    Run one Miller-Rabin round for an odd n with n - 1 = d * 2^s.
+
+    Returns:
+        bool: False if a witnesses that n is composite, True otherwise.
+    """
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def is_prime(n, rounds=40):
     """
     Check if a number is prime.
 
+    Small factors are ruled out first with a single gcd against the product of
+    the primes below 1000. The Miller-Rabin test follows, with a fixed set of
+    bases that makes the answer exact for n < 2^64, and ``rounds`` random bases
+    above that, for an error probability of at most 4^-rounds. The random bases
+    come from the ``secrets`` module, so they cannot be predicted and a
+    composite cannot be crafted to pass.
+
     Args:
         n (int): The number to check.
+        rounds (int): The number of random Miller-Rabin bases for n >= 2^64.
 
     Returns:
         bool: True if the number is prime, False otherwise.
+
+    Raises:
+        ValueError: If rounds is less than 1.
     """
-    if n <= 1:
+    if not isinstance(rounds, int) or rounds < 1:
+        raise ValueError("rounds must be a positive integer")
+    if n < 2:
         return False
-    if n <= 3:
-        return True
-    if n % 2 == 0 or n % 3 == 0:
+    if n < 1000:
+        return n in _SIEVE_PRIMES
+    if math.gcd(n, _SIEVE_PRODUCT) != 1:
         return False
-    i = 5
-    while i * i <= n:
-        if n % i == 0 or n % (i + 2) == 0:
-            return False
-        i += 6
-    return True
+    if n < 1000 * 1000:
+        return True
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    if n < 1 << 64:
+        bases = _DETERMINISTIC_BASES
+    else:
+        bases = (2 + secrets.randbelow(n - 3) for _ in range(rounds))
+    return all(_miller_rabin(n, d, s, a) for a in bases)
 
 def mod_inverse(a, m):
     """
@@ -45,3 +112,172 @@ def mod_inverse(a, m):
     if x1 < 0:
         x1 += m0
     return x1
+
+
+class FixedBaseExponentiation:
+    """
+    Precomputed table for raising one fixed base to many exponents modulo m.
+
+    This is the fixed-window (Brickell-Gordon-McCurley-Wilson) method: row i of
+    the table holds base^(j * 2^(w * i)) for every w-bit digit j, so base^e is
+    the product of one table entry per w-bit digit of e. That costs
+    ceil(bits / w) modular multiplications and no squarings, against about
+    1.2 * bits for square-and-multiply.
+    """
+
+    def __init__(self, base, modulus, exponent_bits, window=6):
+        """
+        Build the table.
+
+        Args:
+            base (int): The fixed base.
+            modulus (int): The modulus.
+            exponent_bits (int): The largest exponent size, in bits, served from the table.
+            window (int): The digit size w; the table holds ceil(bits / w) * 2^w entries.
+
+        Raises:
+            ValueError: If the modulus, exponent size or window is not positive.
+        """
+        if modulus <= 0 or exponent_bits <= 0 or window <= 0:
+            raise ValueError("The modulus, exponent size and window must be positive.")
+        self.base = base
+        self.modulus = modulus
+        self.exponent_bits = exponent_bits
+        self.window = window
+        self.table = []
+        g = base % modulus
+        for _ in range(-(-exponent_bits // window)):
+            row = [1, g]
+            for _ in range(2, 1 << window):
+                row.append(row[-1] * g % modulus)
+            self.table.append(row)
+            # g^(2^w - 1) * g is the base of the next row
+            g = row[-1] * g % modulus
+
+    def pow(self, exponent):
+        """
+        Compute base^exponent mod modulus.
+
+        Exponents outside the table's range fall back to the built-in ``pow``.
+
+        Args:
+            exponent (int): The exponent.
+
+        Returns:
+            int: The result.
+        """
+        if exponent < 0 or exponent.bit_length() > self.exponent_bits:
+            return pow(self.base, exponent, self.modulus)
+        modulus, mask, window = self.modulus, (1 << self.window) - 1, self.window
+        result = 1
+        for row in self.table:
+            if not exponent:
+                break
+            digit = exponent & mask
+            if digit:
+                result = result * row[digit] % modulus
+            exponent >>= window
+        return result % modulus
+
+
+@functools.lru_cache(maxsize=32)
+def fixed_base_table(base, modulus, exponent_bits, window=6):
+    """
+    Return a shared ``FixedBaseExponentiation`` table for a parameter set.
+
+    Tables are cached by their parameters, so every user of the same base and
+    modulus (e.g. every DSA instance with the same p and g) builds it only once.
+
+    Args:
+        base (int): The fixed base.
+        modulus (int): The modulus.
+        exponent_bits (int): The largest exponent size, in bits, served from the table.
+        window (int): The digit size.
+
+    Returns:
+        FixedBaseExponentiation: The table.
+    """
+    return FixedBaseExponentiation(base, modulus, exponent_bits, window)
+
+
+def simultaneous_exponentiation(x, a, y, b, multiply, square=None, window=2):
+    """
+    Compute x^a * y^b in any group with Straus's (Shamir's) trick.
+
+    Both exponents are scanned together, ``window`` bits at a time, so the two
+    powers share one chain of squarings. Each step multiplies in one entry of a
+    precomputed table of x^i * y^j. Against two separate exponentiations, that
+    saves roughly one full squaring chain.
+
+    The group is given by its operation only, so the same routine computes
+    u1 * G + u2 * Q on an elliptic curve with point addition and doubling.
+    The identity element is never needed. It is represented internally by
+    None, and None is returned when both exponents are zero.
+
+    Args:
+        x: The first base.
+        a (int): The exponent of x.
+        y: The second base.
+        b (int): The exponent of y.
+        multiply (callable): The group operation.
+        square (callable, optional): A dedicated squaring (doubling) operation;
+            multiply(v, v) is used if omitted.
+        window (int): The number of exponent bits processed per step.
+
+    Returns:
+        The group element x^a * y^b, or None for the identity.
+
+    Raises:
+        ValueError: If an exponent is negative or the window is not positive.
+    """
+    if a < 0 or b < 0:
+        raise ValueError("Exponents must be non-negative.")
+    if window <= 0:
+        raise ValueError("The window must be positive.")
+    if square is None:
+        square = lambda v: multiply(v, v)
+
+    def combine(u, v):
+        if u is None:
+            return v
+        if v is None:
+            return u
+        return multiply(u, v)
+
+    size = 1 << window
+    xs, ys = [None, x], [None, y]
+    for _ in range(2, size):
+        xs.append(combine(xs[-1], x))
+        ys.append(combine(ys[-1], y))
+    table = [[combine(xi, yj) for yj in ys] for xi in xs]
+    mask = size - 1
+    top = (max(a.bit_length(), b.bit_length()) - 1) // window * window
+    result = None
+    for shift in range(top, -1, -window):
+        if result is not None:
+            for _ in range(window):
+                result = square(result)
+        entry = table[(a >> shift) & mask][(b >> shift) & mask]
+        if entry is not None:
+            result = combine(result, entry)
+    return result
+
+
+def double_exponentiation(x, a, y, b, modulus, window=2):
+    """
+    Compute x^a * y^b mod modulus with a shared squaring chain.
+
+    Args:
+        x (int): The first base.
+        a (int): The exponent of x.
+        y (int): The second base.
+        b (int): The exponent of y.
+        modulus (int): The modulus.
+        window (int): The number of exponent bits processed per step.
+
+    Returns:
+        int: x^a * y^b mod modulus.
+    """
+    result = simultaneous_exponentiation(x % modulus, a, y % modulus, b,
+                                         lambda u, v: u * v % modulus, window=window)
+    return 1 % modulus if result is None else result
@@ -1,28 +1,92 @@
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 import hashlib
 import hmac
+import os
+import threading
+import time
 
-def pbkdf2_hmac(hash_name, password, salt, iterations, dklen=None):
+_TRANS_5C = bytes(x ^ 0x5C for x in range(256))
+_TRANS_36 = bytes(x ^ 0x36 for x in range(256))
+
+
+def _hmac_states(hash_name, password):
     """
-    Implement the PBKDF2 key derivation function with HMAC as the pseudorandom function.
+    Compute the keyed HMAC inner and outer hash states for a password once.
 
     Args:
-        hash_name (str): The name of the hash function to use (e.g., 'sha256').
+        hash_name (str): The name of the hash function to use.
+        password (bytes): The HMAC key.
+
+    Returns:
+        tuple: The inner and outer hash objects, already fed the padded key.
+    """
+    inner = hashlib.new(hash_name)
+    outer = hashlib.new(hash_name)
+    block_size = inner.block_size
+    if len(password) > block_size:
+        password = hashlib.new(hash_name, password).digest()
+    password = password + b'\x00' * (block_size - len(password))
+    inner.update(password.translate(_TRANS_36))
+    outer.update(password.translate(_TRANS_5C))
+    return inner, outer
+
+
+def _derive_block(hash_name, password, salt, iterations, index):
+    """
+    Compute one PBKDF2 output block F(P, S, c, i).
+
+    The keyed HMAC states are computed once and copied for every iteration,
+    and the running XOR of the U values is kept as a single integer.
+
+    Args:
+        hash_name (str): The name of the hash function to use.
         password (bytes): The password to derive the key from.
         salt (bytes): The salt to use in the key derivation.
         iterations (int): The number of iterations to perform.
-        dklen (int, optional): The length of the derived key. If None, the length of the hash function output is used.
+        index (int): The 1-based block index i.
 
     Returns:
-        bytes: The derived key.
+        bytes: The output block, one hash digest long.
     """
+    inner, outer = _hmac_states(hash_name, password)
+    icpy = inner.copy()
+    ocpy = outer.copy()
+    icpy.update(salt + index.to_bytes(4, 'big'))
+    ocpy.update(icpy.digest())
+    U = ocpy.digest()
+    result = int.from_bytes(U, 'big')
+    for _ in range(1, iterations):
+        icpy = inner.copy()
+        ocpy = outer.copy()
+        icpy.update(U)
+        ocpy.update(icpy.digest())
+        U = ocpy.digest()
+        result ^= int.from_bytes(U, 'big')
+    return result.to_bytes(len(U), 'big')
+
+
+def _check_secret(password, salt):
+    """Validate the types of a password and salt pair."""
     if not isinstance(password, bytes):
         raise TypeError("Password must be a byte string")
     if not isinstance(salt, bytes):
         raise TypeError("Salt must be a byte string")
+
+
+def _check_parameters(hash_name, iterations, dklen, workers):
+    """
+    Validate the derivation parameters shared by every password and salt pair.
+
+    Returns:
+        tuple: The effective derived key length and the number of output blocks.
+    """
     if not isinstance(iterations, int) or iterations <= 0:
         raise ValueError("Iterations must be a positive integer")
     if dklen is not None and (not isinstance(dklen, int) or dklen <= 0):
         raise ValueError("dklen must be a positive integer or None")
+    if workers is not None and (not isinstance(workers, int) or workers <= 0):
+        raise ValueError("workers must be a positive integer or None")
 
     hash_func = hashlib.new(hash_name)
     hlen = hash_func.digest_size
@@ -32,16 +96,252 @@ def pbkdf2_hmac(hash_name, password, salt, iterations, dklen=None):
     if dklen > (2**32 - 1) * hlen:
         raise OverflowError("dklen too large")
 
-    def F(P, S, c, i):
-        U = hmac.new(P, S + i.to_bytes(4, 'big'), hash_name).digest()
-        result = bytearray(U)
-        for _ in range(1, c):
-            U = hmac.new(P, U, hash_name).digest()
-            result = bytearray(x ^ y for x, y in zip(result, U))
-        return bytes(result)
+    return dklen, -(-dklen // hlen)
+
+
+def _derive_chunk(hash_name, iterations, dklen, l, pairs):
+    """
+    Derive keys for a chunk of password and salt pairs with pre-validated parameters.
+
+    Args:
+        hash_name (str): The name of the hash function to use.
+        iterations (int): The number of iterations to perform.
+        dklen (int): The length of each derived key.
+        l (int): The number of output blocks per key.
+        pairs (list): The (password, salt) pairs.
+
+    Returns:
+        list: The derived keys, in the order of pairs.
+    """
+    return [b''.join(_derive_block(hash_name, password, salt, iterations, i + 1) for i in range(l))[:dklen]
+            for password, salt in pairs]
 
-    l = -(-dklen // hlen)
-    r = dklen - (l - 1) * hlen
 
-    derived_key = b''.join(F(password, salt, iterations, i + 1) for i in range(l))
+def pbkdf2_hmac(hash_name, password, salt, iterations, dklen=None, workers=None):
+    """
+    Implement the PBKDF2 key derivation function with HMAC as the pseudorandom function.
+
+    When dklen is larger than the hash output, each output block is independent;
+    with ``workers`` greater than 1 the blocks are derived in parallel in a process
+    pool, so long key material costs about the wall time of a single block.
+
+    Args:
+        hash_name (str): The name of the hash function to use (e.g., 'sha256').
+        password (bytes): The password to derive the key from.
+        salt (bytes): The salt to use in the key derivation.
+        iterations (int): The number of iterations to perform.
+        dklen (int, optional): The length of the derived key. If None, the length of the hash function output is used.
+        workers (int, optional): The number of processes used to derive output blocks in parallel.
+
+    Returns:
+        bytes: The derived key.
+    """
+    _check_secret(password, salt)
+    dklen, l = _check_parameters(hash_name, iterations, dklen, workers)
+
+    if workers is not None and workers > 1 and l > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, l)) as executor:
+            blocks = executor.map(_derive_block, [hash_name] * l, [password] * l, [salt] * l,
+                                  [iterations] * l, range(1, l + 1))
+            derived_key = b''.join(blocks)
+    else:
+        derived_key = b''.join(_derive_block(hash_name, password, salt, iterations, i + 1) for i in range(l))
     return derived_key[:dklen]
+
+
+def pbkdf2_hmac_batch(hash_name, pairs, iterations, dklen=None, workers=None, chunksize=16):
+    """
+    Derive PBKDF2 keys for many (password, salt) pairs, yielding them in input order.
+
+    The shared parameters are validated once for the whole batch. With
+    ``workers`` greater than 1, pairs are grouped into chunks and dispatched to
+    a process pool; only a bounded number of chunks is in flight at a time, so
+    the input iterable is consumed lazily and results stream out as soon as the
+    earliest outstanding chunk completes.
+
+    Args:
+        hash_name (str): The name of the hash function to use (e.g., 'sha256').
+        pairs (iterable): The (password, salt) pairs, both as bytes.
+        iterations (int): The number of iterations to perform.
+        dklen (int, optional): The length of each derived key. If None, the length of the hash function output is used.
+        workers (int, optional): The number of processes to use; derives serially if None or 1.
+        chunksize (int): The number of pairs sent to a worker at once.
+
+    Yields:
+        bytes: The derived key for each pair, in input order.
+    """
+    if not isinstance(chunksize, int) or chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer")
+    dklen, l = _check_parameters(hash_name, iterations, dklen, workers)
+
+    def chunks():
+        chunk = []
+        for password, salt in pairs:
+            _check_secret(password, salt)
+            chunk.append((password, salt))
+            if len(chunk) == chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    if workers is None or workers == 1:
+        for chunk in chunks():
+            yield from _derive_chunk(hash_name, iterations, dklen, l, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks():
+            in_flight.append(executor.submit(_derive_chunk, hash_name, iterations, dklen, l, chunk))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+class DerivedKeyCache:
+    """
+    In-memory cache of PBKDF2-derived keys with TTL and LRU eviction.
+
+    Entries are looked up by an HMAC-SHA256 digest of the derivation
+    parameters under a random per-cache secret, so neither passwords nor
+    unkeyed password hashes are kept in memory. Cached keys are held in
+    bytearrays that are overwritten with zeros when they expire, are evicted
+    or the cache is cleared.
+    """
+
+    def __init__(self, max_entries=128, ttl=300.0, clock=time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): The maximum number of derived keys kept.
+            ttl (float): The number of seconds a derived key stays valid.
+            clock (callable): The monotonic time source, in seconds.
+
+        Raises:
+            ValueError: If max_entries or ttl is not positive.
+        """
+        if not isinstance(max_entries, int) or max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._secret = os.urandom(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        """float: The fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _digest(self, hash_name, password, salt, iterations, dklen):
+        """Return the keyed digest identifying one set of derivation parameters."""
+        mac = hmac.new(self._secret, digestmod='sha256')
+        for field in (hash_name.encode('utf-8'), password, salt, str(iterations).encode(), str(dklen).encode()):
+            mac.update(len(field).to_bytes(8, 'big'))
+            mac.update(field)
+        return mac.digest()
+
+    def derive(self, hash_name, password, salt, iterations, dklen=None):
+        """
+        Return the PBKDF2 key for the parameters, deriving it only on a miss.
+
+        Args:
+            hash_name (str): The name of the hash function to use (e.g., 'sha256').
+            password (bytes): The password to derive the key from.
+            salt (bytes): The salt to use in the key derivation.
+            iterations (int): The number of iterations to perform.
+            dklen (int, optional): The length of the derived key.
+
+        Returns:
+            bytes: The derived key.
+        """
+        key = self.lookup(hash_name, password, salt, iterations, dklen)
+        if key is None:
+            key = pbkdf2_hmac(hash_name, password, salt, iterations, dklen)
+            self.store(hash_name, password, salt, iterations, dklen, key)
+        return key
+
+    def lookup(self, hash_name, password, salt, iterations, dklen=None):
+        """
+        Return the cached key for the parameters, or None on a miss.
+
+        Together with ``store`` this lets the derivation itself run elsewhere,
+        e.g. on a process pool, while the cache stays in the calling process.
+
+        Args:
+            hash_name (str): The name of the hash function to use (e.g., 'sha256').
+            password (bytes): The password to derive the key from.
+            salt (bytes): The salt to use in the key derivation.
+            iterations (int): The number of iterations to perform.
+            dklen (int, optional): The length of the derived key.
+
+        Returns:
+            bytes | None: The cached key, if present and not expired.
+        """
+        if not isinstance(password, bytes):
+            raise TypeError("Password must be a byte string")
+        if not isinstance(salt, bytes):
+            raise TypeError("Salt must be a byte string")
+        digest = self._digest(hash_name, password, salt, iterations, dklen)
+        with self._lock:
+            self._expire(self.clock())
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return bytes(entry[1])
+            self.misses += 1
+        return None
+
+    def store(self, hash_name, password, salt, iterations, dklen, key):
+        """
+        Cache a key derived for the parameters.
+
+        Args:
+            hash_name (str): The name of the hash function used.
+            password (bytes): The password the key was derived from.
+            salt (bytes): The salt used in the key derivation.
+            iterations (int): The number of iterations performed.
+            dklen (int | None): The requested key length, as passed to ``lookup``.
+            key (bytes): The derived key.
+        """
+        digest = self._digest(hash_name, password, salt, iterations, dklen)
+        with self._lock:
+            previous = self._entries.pop(digest, None)
+            if previous is not None:
+                self._zeroize(previous[1])
+            self._entries[digest] = (self.clock() + self.ttl, bytearray(key))
+            while len(self._entries) > self.max_entries:
+                self._zeroize(self._entries.popitem(last=False)[1][1])
+
+    def _expire(self, now):
+        """Zero and drop every entry whose TTL has passed; the caller holds the lock."""
+        expired = [digest for digest, (deadline, _) in self._entries.items() if deadline <= now]
+        for digest in expired:
+            self._zeroize(self._entries.pop(digest)[1])
+
+    def clear(self):
+        """Zero and drop every cached key, and reset the hit/miss counters."""
+        with self._lock:
+            for _, key in self._entries.values():
+                self._zeroize(key)
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def _zeroize(key):
+        """Overwrite a cached key with zeros."""
+        key[:] = bytes(len(key))
@@ -1,10 +1,123 @@
-import random
-from crypto.number_theory import is_prime, mod_inverse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import hashlib
+import hmac
+import itertools
+import os
+import secrets
+from crypto.number_theory import is_prime, mod_inverse, small_primes
 from group_theory.galois_field import GaloisField
 
+class RSAPrivateKey:
+    """
+    Represents an RSA private key in Chinese Remainder Theorem form.
+
+    Besides d and n, the key keeps the primes p and q together with
+    dP = d mod (p - 1), dQ = d mod (q - 1) and qInv = q^-1 mod p, so a private
+    operation is two half-size exponentiations plus a recombination instead of
+    one full-size exponentiation. The key still unpacks as ``d, n = key`` for
+    callers written against the old (d, n) tuples.
+    """
+
+    def __init__(self, d, n, p=None, q=None):
+        """
+        Initialize the private key.
+
+        Args:
+            d (int): The private exponent.
+            n (int): The modulus.
+            p (int, optional): The first prime factor of n.
+            q (int, optional): The second prime factor of n. Without p and q the
+                key falls back to plain exponentiation modulo n.
+
+        Raises:
+            ValueError: If only one prime is given or the primes do not multiply to n.
+        """
+        if (p is None) != (q is None):
+            raise ValueError("Both prime factors p and q are required for a CRT key.")
+        if p is not None and p * q != n:
+            raise ValueError("The prime factors do not match the modulus.")
+        self.d = d
+        self.n = n
+        self.p = p
+        self.q = q
+        if p is not None:
+            self.dP = d % (p - 1)
+            self.dQ = d % (q - 1)
+            self.qInv = mod_inverse(q, p)
+
+    def __iter__(self):
+        """Unpack as the (d, n) pair."""
+        return iter((self.d, self.n))
+
+    def __getitem__(self, index):
+        """Index as the (d, n) pair."""
+        return (self.d, self.n)[index]
+
+    def __len__(self):
+        """Report the length of the (d, n) pair."""
+        return 2
+
+    def __eq__(self, other):
+        """Compare with another key, or with a (d, n) tuple."""
+        if isinstance(other, RSAPrivateKey):
+            return (self.d, self.n, self.p, self.q) == (other.d, other.n, other.p, other.q)
+        if isinstance(other, tuple):
+            return (self.d, self.n) == other
+        return NotImplemented
+
+    def __hash__(self):
+        """Hash consistently with the (d, n) pair."""
+        return hash((self.d, self.n))
+
+    def __repr__(self):
+        # Never include the secret values
+        return f"RSAPrivateKey(bits={self.n.bit_length()}, crt={self.p is not None})"
+
+    @classmethod
+    def from_key(cls, private_key):
+        """
+        Return private_key as an RSAPrivateKey.
+
+        Args:
+            private_key (RSAPrivateKey | tuple): A private key or a legacy (d, n) tuple.
+
+        Returns:
+            RSAPrivateKey: The key itself, or a key without CRT parameters for a tuple.
+        """
+        if isinstance(private_key, cls):
+            return private_key
+        d, n = private_key
+        return cls(d, n)
+
+    def power(self, c):
+        """
+        Raise c to the private exponent modulo n.
+
+        Args:
+            c (int): The ciphertext or message representative, 0 <= c < n.
+
+        Returns:
+            int: c^d mod n.
+        """
+        if self.p is None:
+            return pow(c, self.d, self.n)
+        p, q = self.p, self.q
+        m1 = pow(c % p, self.dP, p)
+        m2 = pow(c % q, self.dQ, q)
+        return m2 + (self.qInv * (m1 - m2) % p) * q
+
+
 class RSA:
     """Represents the RSA (Rivest-Shamir-Adleman) algorithm."""
 
+    # Odd primes used to sieve prime candidates, with the inverse of 2 modulo each
+    sieve_primes = small_primes(1 << 15)[1:]
+    sieve_halves = [(p + 1) // 2 for p in sieve_primes]
+    # Number of consecutive odd candidates sieved at a time
+    sieve_window = 4096
+    # Digest size of SHA-256, the OAEP hash and mask generation function
+    oaep_hash_size = 32
+
     def __init__(self, key_size=1024):
         """
         Initialize the RSA algorithm with a specified key size.
@@ -14,32 +127,200 @@ class RSA:
         """
         self.key_size = key_size
 
-    def generate_keys(self):
+    def generate_keys(self, workers=None):
         """
         Generate RSA public and private keys.
 
+        With ``workers`` greater than 1, the prime search is spread over a
+        process pool: every worker sieves a different random window, the first
+        two distinct primes found become p and q, and the windows that have not
+        started are cancelled. Each window stops at its first prime, so waiting
+        for the ones already running costs at most about one more window.
+
+        Args:
+            workers (int, optional): The number of processes to use; searches serially if None or 1.
+
         Returns:
-            tuple: The generated private key and public key.
+            tuple: The generated private key (an RSAPrivateKey, which unpacks as
+                (d, n)) and public key (e, n).
+        """
+        self._check_workers(workers)
+        if workers is None or workers == 1:
+            p = self.generate_prime()
+            q = self.generate_prime()
+            while q == p:
+                q = self.generate_prime()
+            return self._key_pair(p, q)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # One window per worker, so little beyond the running windows is left to wait for
+            primes = self._parallel_primes(executor, workers)
+            try:
+                p = next(primes)
+                q = next(q for q in primes if q != p)
+            finally:
+                primes.close()
+        return self._key_pair(p, q)
+
+    def generate_keys_batch(self, count, workers=None):
         """
-        p = self.generate_prime()
-        q = self.generate_prime()
+        Generate many key pairs, yielding each one as soon as its primes are found.
+
+        One process pool is kept busy with prime searches for the whole batch,
+        and consecutive distinct primes are paired into keys as they complete.
+
+        Args:
+            count (int): The number of key pairs to generate.
+            workers (int, optional): The number of processes to use; one per CPU if None.
+
+        Yields:
+            tuple: A private key and public key for each pair.
+        """
+        self._check_workers(workers)
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for _ in range(count):
+                yield self.generate_keys()
+            return
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            primes = self._parallel_primes(executor, 2 * workers)
+            try:
+                for _ in range(count):
+                    p = next(primes)
+                    q = next(q for q in primes if q != p)
+                    yield self._key_pair(p, q)
+            finally:
+                primes.close()
+
+    @staticmethod
+    def _check_workers(workers):
+        """Raise ValueError unless workers is None or a positive integer."""
+        if workers is not None and (not isinstance(workers, int) or workers <= 0):
+            raise ValueError("workers must be a positive integer or None")
+
+    def _key_pair(self, p, q):
+        """Build the private and public keys from two distinct primes."""
         n = p * q
         phi = (p - 1) * (q - 1)
         e = self.choose_e(phi)
         d = mod_inverse(e, phi)
-        return (d, n), (e, n)
+        return RSAPrivateKey(d, n, p, q), (e, n)
 
-    def generate_prime(self):
+    def _parallel_primes(self, executor, depth):
+        """
+        Yield primes found by search-window tasks on a process pool, in completion order.
+
+        ``depth`` windows are kept in flight; windows that hold no prime are
+        replaced by new ones. Closing the generator cancels every window that
+        has not started yet.
+
+        Args:
+            executor (concurrent.futures.ProcessPoolExecutor): The pool to search on.
+            depth (int): The number of windows kept in flight.
+
+        Yields:
+            int: Primes of half the key size.
+        """
+        bits = self.key_size // 2
+        self._check_bits(bits)
+        in_flight = set()
+        try:
+            while True:
+                while len(in_flight) < depth:
+                    in_flight.add(executor.submit(_search_window_task, self.key_size, self._random_start(bits), bits))
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    prime = future.result()
+                    if prime is not None:
+                        yield prime
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def generate_prime(self, bits=None):
         """
         Generate a prime number of the specified key size.
 
+        The search starts at a random odd number with its top two bits set, so
+        the product of two such primes has exactly twice as many bits. It then
+        walks upwards over odd numbers, keeping the residues of the current
+        position modulo a few thousand small primes. Candidates are sieved a
+        window at a time with those residues, so only the numbers without small
+        factors reach the Miller-Rabin test.
+
+        Args:
+            bits (int, optional): The size of the prime in bits; half the key size by default.
+
         Returns:
             int: The generated prime number.
+
+        Raises:
+            ValueError: If bits is too small to search with the sieve.
         """
+        bits = self.key_size // 2 if bits is None else bits
+        self._check_bits(bits)
+        limit = 1 << bits
+        step = 2 * self.sieve_window
         while True:
-            prime_candidate = random.getrandbits(self.key_size // 2)
-            if is_prime(prime_candidate):
-                return prime_candidate
+            start = self._random_start(bits)
+            residues = [start % p for p in self.sieve_primes]
+            while start < limit:
+                prime = self._search_window(start, bits, residues)
+                if prime is not None:
+                    return prime
+                start += step
+                residues = [(r + step) % p for r, p in zip(residues, self.sieve_primes)]
+
+    @staticmethod
+    def _check_bits(bits):
+        """Raise ValueError if primes of this size are too small to search with the sieve."""
+        if bits < 16:
+            raise ValueError("Prime size must be at least 16 bits.")
+
+    @staticmethod
+    def _random_start(bits):
+        """Return a random odd number of the given size with its top two bits set."""
+        return secrets.randbits(bits) | (3 << (bits - 2)) | 1
+
+    def _sieve(self, residues):
+        """
+        Sieve one window of odd candidates start, start + 2, start + 4, ...
+
+        Args:
+            residues (list): start modulo each of the sieve primes.
+
+        Returns:
+            iterator: The offsets k for which start + 2k has no sieve-prime factor.
+        """
+        window = self.sieve_window
+        sieve = bytearray([1]) * window
+        for p, half, r in zip(self.sieve_primes, self.sieve_halves, residues):
+            # start + 2k is divisible by p exactly when k = -r / 2 (mod p)
+            k = (p - r) * half % p
+            sieve[k::p] = bytes(len(range(k, window, p)))
+        return itertools.compress(range(window), sieve)
+
+    def _search_window(self, start, bits, residues=None):
+        """
+        Return the first prime in one sieve window starting at an odd start.
+
+        Args:
+            start (int): The first candidate; must exceed the largest sieve prime.
+            bits (int): The size of the prime in bits; candidates must stay below 2^bits.
+            residues (list, optional): start modulo each sieve prime, computed if omitted.
+
+        Returns:
+            int | None: The prime found, or None if the window holds none.
+        """
+        if residues is None:
+            residues = [start % p for p in self.sieve_primes]
+        limit = 1 << bits
+        for k in self._sieve(residues):
+            candidate = start + 2 * k
+            if candidate >= limit:
+                return None
+            if is_prime(candidate):
+                return candidate
+        return None
 
     def choose_e(self, phi):
         """
@@ -80,12 +361,192 @@ class RSA:
 
         Args:
             ciphertext (list): The ciphertext to decrypt.
-            private_key (tuple): The private key (d, n).
+            private_key (RSAPrivateKey | tuple): The private key; CRT is used when
+                it carries the prime factors, and a (d, n) tuple is also accepted.
 
         Returns:
             str: The decrypted plaintext.
         """
-        d, n = private_key
-        plaintext_bytes = [pow(byte, d, n) for byte in ciphertext]
+        power = RSAPrivateKey.from_key(private_key).power
+        plaintext_bytes = [power(byte) for byte in ciphertext]
         plaintext = ''.join(chr(byte) for byte in plaintext_bytes)
         return plaintext
+
+
+    @staticmethod
+    def _mgf1(seed, length):
+        """
+        Expand a seed into a mask with MGF1 over SHA-256 (RFC 8017, B.2.1).
+
+        Args:
+            seed (bytes): The seed.
+            length (int): The mask length in bytes.
+
+        Returns:
+            bytes: The mask.
+        """
+        blocks = -(-length // 32)
+        return b''.join(hashlib.sha256(seed + i.to_bytes(4, 'big')).digest() for i in range(blocks))[:length]
+
+    @staticmethod
+    def _xor(data, mask):
+        """XOR two byte strings of equal length."""
+        return (int.from_bytes(data, 'big') ^ int.from_bytes(mask, 'big')).to_bytes(len(data), 'big')
+
+    @staticmethod
+    def _oaep_label_hash(label, index, total, chain):
+        """Hash the label with a block's position, the block count and the digest of the preceding blocks."""
+        return hashlib.sha256(label + index.to_bytes(4, 'big') + total.to_bytes(4, 'big') + chain.digest()).digest()
+
+    def _oaep_sizes(self, n):
+        """Return the block size k and the largest message per block for modulus n."""
+        k = (n.bit_length() + 7) // 8
+        capacity = k - 2 * self.oaep_hash_size - 2
+        if capacity <= 0:
+            raise ValueError("The key is too small for OAEP with SHA-256.")
+        return k, capacity
+
+    def encrypt_oaep(self, plaintext, public_key, label=b""):
+        """
+        Encrypt data with RSAES-OAEP (RFC 8017), using SHA-256 and MGF1.
+
+        The data is split into chunks of up to k - 66 bytes, where k is the size
+        of the modulus in bytes. Each chunk is padded and encrypted with one
+        exponentiation into a k-byte block, and the blocks are concatenated.
+        Each block's label hash also covers its index, the number of blocks and
+        a digest of the ciphertext blocks before it, so blocks cannot be
+        reordered, dropped, duplicated or spliced in from another message
+        without decryption failing.
+
+        Args:
+            plaintext (str | bytes): The data to encrypt; strings are encoded as UTF-8.
+            public_key (tuple): The public key (e, n).
+            label (bytes, optional): A label bound to the ciphertext.
+
+        Returns:
+            bytes: The ciphertext, a whole number of k-byte blocks.
+
+        Raises:
+            ValueError: If the key is too small for OAEP.
+        """
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode('utf-8')
+        plaintext = bytes(plaintext)
+        e, n = public_key
+        k, capacity = self._oaep_sizes(n)
+        h = self.oaep_hash_size
+        offsets = range(0, max(len(plaintext), 1), capacity)
+        chain = hashlib.sha256()
+        blocks = []
+        for index, offset in enumerate(offsets):
+            message = plaintext[offset:offset + capacity]
+            label_hash = self._oaep_label_hash(label, index, len(offsets), chain)
+            db = label_hash + bytes(capacity - len(message)) + b'\x01' + message
+            seed = secrets.token_bytes(h)
+            masked_db = self._xor(db, self._mgf1(seed, k - h - 1))
+            masked_seed = self._xor(seed, self._mgf1(masked_db, h))
+            m = int.from_bytes(b'\x00' + masked_seed + masked_db, 'big')
+            blocks.append(pow(m, e, n).to_bytes(k, 'big'))
+            chain.update(blocks[-1])
+        return b''.join(blocks)
+
+    def decrypt_oaep(self, ciphertext, private_key, label=b""):
+        """
+        Decrypt data produced by ``encrypt_oaep``.
+
+        Args:
+            ciphertext (bytes): The ciphertext, a whole number of k-byte blocks.
+            private_key (RSAPrivateKey | tuple): The private key; CRT is used when
+                it carries the prime factors.
+            label (bytes, optional): The label used for encryption.
+
+        Returns:
+            bytes: The decrypted data.
+
+        Raises:
+            ValueError: If the ciphertext is malformed, any block fails to decode,
+                or the blocks were reordered, truncated or mixed. The same error
+                is raised for every failure.
+        """
+        key = RSAPrivateKey.from_key(private_key)
+        k, capacity = self._oaep_sizes(key.n)
+        h = self.oaep_hash_size
+        ciphertext = bytes(ciphertext)
+        if not ciphertext or len(ciphertext) % k:
+            raise ValueError("Invalid ciphertext length.")
+        total = len(ciphertext) // k
+        chain = hashlib.sha256()
+        plaintext = []
+        for index, offset in enumerate(range(0, len(ciphertext), k)):
+            c = int.from_bytes(ciphertext[offset:offset + k], 'big')
+            if c >= key.n:
+                raise ValueError("Decryption error.")
+            em = key.power(c).to_bytes(k, 'big')
+            masked_seed, masked_db = em[1:1 + h], em[1 + h:]
+            seed = self._xor(masked_seed, self._mgf1(masked_db, h))
+            db = self._xor(masked_db, self._mgf1(seed, k - h - 1))
+            rest = db[h:].lstrip(b'\x00')
+            label_hash = self._oaep_label_hash(label, index, total, chain)
+            # Check every condition before failing, so all failures look alike
+            valid = hmac.compare_digest(db[:h], label_hash) & (em[0] == 0) & (rest[:1] == b'\x01')
+            if not valid:
+                raise ValueError("Decryption error.")
+            chain.update(ciphertext[offset:offset + k])
+            plaintext.append(rest[1:])
+        return b''.join(plaintext)
+
+    def decrypt_batch(self, ciphertexts, private_key, workers=None, label=b"", chunksize=16):
+        """
+        Decrypt many ciphertexts under one private key, in order.
+
+        Byte strings are decrypted with ``decrypt_oaep`` and lists of integers
+        with ``decrypt``. The private key is converted to CRT form once for the
+        whole batch. With ``workers`` greater than 1, the batch is split into
+        chunks that run on a process pool. A ciphertext that fails to decrypt
+        does not stop the batch; its slot holds the exception instead.
+
+        Args:
+            ciphertexts (iterable): The ciphertexts to decrypt.
+            private_key (RSAPrivateKey | tuple): The private key.
+            workers (int, optional): The number of processes to use; decrypts serially if None or 1.
+            label (bytes, optional): The OAEP label for byte string ciphertexts.
+            chunksize (int): The number of ciphertexts sent to a worker at once.
+
+        Returns:
+            list: The plaintext of each ciphertext, or the exception raised while decrypting it.
+        """
+        self._check_workers(workers)
+        if not isinstance(chunksize, int) or chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer")
+        key = RSAPrivateKey.from_key(private_key)
+        ciphertexts = list(ciphertexts)
+        if workers is None or workers == 1 or len(ciphertexts) <= chunksize:
+            return self._decrypt_chunk(ciphertexts, key, label)
+        chunks = [ciphertexts[i:i + chunksize] for i in range(0, len(ciphertexts), chunksize)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_decrypt_chunk_task, itertools.repeat(self.key_size), chunks,
+                                   itertools.repeat(key), itertools.repeat(label))
+            return [plaintext for chunk in results for plaintext in chunk]
+
+    def _decrypt_chunk(self, ciphertexts, key, label):
+        """Decrypt each ciphertext of a chunk, keeping exceptions in place of failed results."""
+        results = []
+        for ciphertext in ciphertexts:
+            try:
+                if isinstance(ciphertext, (bytes, bytearray, memoryview)):
+                    results.append(self.decrypt_oaep(ciphertext, key, label))
+                else:
+                    results.append(self.decrypt(ciphertext, key))
+            except Exception as error:
+                results.append(error)
+        return results
+
+
+def _decrypt_chunk_task(key_size, ciphertexts, key, label):
+    """Decrypt a chunk of ciphertexts in a worker process."""
+    return RSA(key_size)._decrypt_chunk(ciphertexts, key, label)
+
+
+def _search_window_task(key_size, start, bits):
+    """Search one sieve window in a worker process."""
+    return RSA(key_size)._search_window(start, bits)
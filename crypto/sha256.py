@@ -1,21 +1,259 @@
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import mmap
+import os
+
+from crypto.streaming import read_into
+
 
 class SHA256:
-    """Represents the SHA-256 (Secure Hash Algorithm 256-bit) algorithm."""
+    """
+    Represents the SHA-256 (Secure Hash Algorithm 256-bit) algorithm.
+
+    ``hash``, ``hash_file`` and ``hash_iter`` are one-shot and never touch the
+    instance state. ``update``, ``digest``, ``hexdigest`` and ``copy`` give an
+    incremental interface on the instance's own hasher, so a common prefix can
+    be hashed once and copied for every message that shares it.
+    """
+
+    def __init__(self, data=None):
+        """
+        Initialize the SHA-256 algorithm.
 
-    def __init__(self):
-        """Initialize the SHA-256 algorithm."""
+        Args:
+            data (bytes | bytearray | memoryview, optional): Initial data for the incremental state.
+        """
         self.hasher = hashlib.sha256()
+        if data is not None:
+            self.update(data)
 
     def hash(self, data: str) -> str:
         """
         Hash the input data using SHA-256.
 
         Args:
-            data (str): The input data to hash.
+            data (str | bytes): The input data to hash; strings are encoded as UTF-8.
 
         Returns:
             str: The hexadecimal representation of the hash value.
         """
-        self.hasher.update(data.encode('utf-8'))
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return hashlib.sha256(data).hexdigest()
+
+    def hash_many(self, messages, hex: bool = False, workers: int = None, batch_size: int = 4096) -> list:
+        """
+        Hash many independent messages, returning their digests in order.
+
+        Each message gets its own fresh hash; nothing accumulates between them.
+        The loop binds the hashlib constructor and digest method once, so the
+        only per-message objects are the hash and the digest itself. With
+        ``workers``, messages are hashed in batches on a thread pool; this pays
+        off for longer messages, where hashlib releases the GIL.
+
+        Args:
+            messages (iterable): str (encoded as UTF-8) or bytes-like messages.
+            hex (bool): Whether to return hexadecimal strings instead of raw digests.
+            workers (int, optional): The number of hashing threads; hashes inline if omitted.
+            batch_size (int): The number of messages per thread pool task.
+
+        Returns:
+            list: The digest of each message, in input order.
+        """
+        if workers is None:
+            return self._hash_batch(messages, hex)
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer")
+        messages = list(messages)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batches = executor.map(self._hash_batch,
+                                   (messages[i:i + batch_size] for i in range(0, len(messages), batch_size)),
+                                   [hex] * -(-len(messages) // batch_size))
+            return [digest for batch in batches for digest in batch]
+
+    @staticmethod
+    def _hash_batch(messages, hex):
+        """Hash each message of a batch independently."""
+        sha256 = hashlib.sha256
+        digests = []
+        append = digests.append
+        for message in messages:
+            if isinstance(message, str):
+                message = message.encode('utf-8')
+            hasher = sha256(message)
+            append(hasher.hexdigest() if hex else hasher.digest())
+        return digests
+
+    def update(self, data) -> None:
+        """
+        Feed data into the incremental state.
+
+        Args:
+            data (bytes | bytearray | memoryview): The data to add. Buffers are hashed
+                in place without being copied.
+        """
+        self.hasher.update(data)
+
+    def digest(self) -> bytes:
+        """Return the raw digest of the data fed to ``update`` so far."""
+        return self.hasher.digest()
+
+    def hexdigest(self) -> str:
+        """Return the hexadecimal digest of the data fed to ``update`` so far."""
         return self.hasher.hexdigest()
+
+    def copy(self) -> "SHA256":
+        """
+        Return an independent copy of the incremental state.
+
+        Returns:
+            SHA256: A new instance that continues from the current state.
+        """
+        clone = SHA256()
+        clone.hasher = self.hasher.copy()
+        return clone
+
+    def hash_iter(self, chunks) -> str:
+        """
+        Hash the concatenation of an iterable of chunks.
+
+        Args:
+            chunks (iterable): bytes-like chunks, e.g. from a generator or a socket reader.
+
+        Returns:
+            str: The hexadecimal representation of the hash value.
+        """
+        hasher = hashlib.sha256()
+        for chunk in chunks:
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def hash_file(self, path, chunk_size: int = 1 << 20, use_mmap: bool = True) -> str:
+        """
+        Hash a file in constant memory.
+
+        Regular, non-empty files are memory-mapped and hashed straight from the
+        page cache. Otherwise, or with ``use_mmap=False``, the file is read with
+        ``readinto`` into one reusable buffer, so no chunk is ever allocated.
+
+        Args:
+            path (str | os.PathLike): The file to hash.
+            chunk_size (int): The size of the reusable read buffer.
+            use_mmap (bool): Whether to memory-map the file when possible.
+
+        Returns:
+            str: The hexadecimal representation of the hash value.
+
+        Raises:
+            ValueError: If chunk_size is not a positive integer.
+        """
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if use_mmap and size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        for offset in range(0, size, chunk_size):
+                            hasher.update(view[offset:offset + chunk_size])
+            else:
+                view = memoryview(bytearray(chunk_size))
+                while True:
+                    n = read_into(f, view)
+                    hasher.update(view[:n])
+                    if n < chunk_size:
+                        break
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _leaf_digest(view):
+        """Hash one leaf with the leaf domain-separation prefix."""
+        hasher = hashlib.sha256(b'\x00')
+        hasher.update(view)
+        return hasher.digest()
+
+    def hash_leaves(self, path, indices=None, leaf_size: int = 1 << 22, workers: int = None) -> dict:
+        """
+        Hash selected fixed-size leaves of a file concurrently.
+
+        The file is memory-mapped and each leaf is hashed from a slice of the map
+        on a thread pool; hashlib releases the GIL on large buffers, so leaves are
+        hashed in parallel. Leaf i covers bytes [i * leaf_size, (i + 1) * leaf_size).
+
+        Args:
+            path (str | os.PathLike): The file to hash.
+            indices (iterable, optional): The leaf indices to hash; all leaves if omitted.
+            leaf_size (int): The size of each leaf in bytes.
+            workers (int, optional): The number of hashing threads.
+
+        Returns:
+            dict: The raw leaf digest for each requested index.
+
+        Raises:
+            ValueError: If leaf_size is not a positive integer.
+            IndexError: If a requested leaf lies beyond the end of the file.
+        """
+        if not isinstance(leaf_size, int) or leaf_size <= 0:
+            raise ValueError("leaf_size must be a positive integer")
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            count = max(1, -(-size // leaf_size))
+            indices = range(count) if indices is None else list(indices)
+            for index in indices:
+                if not 0 <= index < count:
+                    raise IndexError(f"Leaf index {index} is out of range for {count} leaves.")
+            if size == 0:
+                return {index: self._leaf_digest(b'') for index in indices}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view, ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = {index: executor.submit(self._leaf_digest,
+                                                      view[index * leaf_size:(index + 1) * leaf_size])
+                               for index in indices}
+                    return {index: future.result() for index, future in futures.items()}
+
+    @staticmethod
+    def merkle_root(leaf_digests) -> bytes:
+        """
+        Combine leaf digests into a Merkle root.
+
+        Interior nodes hash a 0x01 prefix followed by the two child digests,
+        while leaves carry a 0x00 prefix, so leaves and nodes cannot collide. An
+        unpaired node at the end of a level is promoted to the next level as is.
+
+        Args:
+            leaf_digests (list): The raw leaf digests in file order.
+
+        Returns:
+            bytes: The raw root digest.
+        """
+        level = list(leaf_digests)
+        if not level:
+            raise ValueError("At least one leaf digest is required.")
+        while len(level) > 1:
+            paired = [hashlib.sha256(b'\x01' + level[i] + level[i + 1]).digest()
+                      for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                paired.append(level[-1])
+            level = paired
+        return level[0]
+
+    def tree_hash(self, path, leaf_size: int = 1 << 22, workers: int = None) -> (str, list):
+        """
+        Hash a file as a Merkle tree of fixed-size leaves hashed in parallel.
+
+        The leaf digests are returned with the root, so a later check of some
+        chunks, or a re-hash after some chunks changed, only needs ``hash_leaves``
+        for those indices followed by ``merkle_root`` over the updated list.
+
+        Args:
+            path (str | os.PathLike): The file to hash.
+            leaf_size (int): The size of each leaf in bytes.
+            workers (int, optional): The number of hashing threads.
+
+        Returns:
+            tuple: The hexadecimal root digest and the list of raw leaf digests.
+        """
+        leaves = self.hash_leaves(path, leaf_size=leaf_size, workers=workers)
+        leaf_digests = [leaves[index] for index in range(len(leaves))]
+        return self.merkle_root(leaf_digests).hex(), leaf_digests
@@ -0,0 +1,35 @@
+def read_into(reader, view):
+    """
+    Fill a buffer from a binary reader, retrying short reads until it is full or the reader is exhausted.
+
+    Readers that provide ``readinto`` are filled in place; others fall back to ``read``.
+    The reader must be blocking: a non-blocking reader returns None when no data
+    is available yet, which is not the end of the stream, so it is reported as
+    an error rather than silently truncating the input.
+
+    Args:
+        reader: A blocking binary file-like object such as an open file or ``socket.makefile('rb')``.
+        view (memoryview): The writable buffer to fill.
+
+    Returns:
+        int: The number of bytes read; less than len(view) only at end of stream.
+
+    Raises:
+        BlockingIOError: If the reader has no data available yet (returns None).
+    """
+    filled = 0
+    readinto = getattr(reader, "readinto", None)
+    while filled < len(view):
+        if readinto is not None:
+            n = readinto(view[filled:])
+        else:
+            data = reader.read(len(view) - filled)
+            n = None if data is None else len(data)
+            if n:
+                view[filled:filled + n] = data
+        if n is None:
+            raise BlockingIOError("The reader has no data available; streams must be read in blocking mode.")
+        if not n:
+            break
+        filled += n
+    return filled
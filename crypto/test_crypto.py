@@ -1,10 +1,24 @@
+import asyncio
+import hashlib
+import io
+import os
+import random
+import tempfile
+import threading
 import unittest
 
+from crypto.aes import AES
+from crypto.aes_batch import BatchAES, np
+from crypto.async_executor import AsyncExecutor
+from crypto.gcm import GCM
+from crypto.pbkdf2 import DerivedKeyCache, pbkdf2_hmac, pbkdf2_hmac_batch
+from group_theory.gf128 import gf128_multiply, gf128_table_multiply, gf128_tables
 from crypto.encryption import Encryption
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from crypto.decryption import Decryption
 from group_theory.galois_field import GaloisField
 from crypto.des import DES
-from crypto.rsa import RSA
+from crypto.rsa import RSA, RSAPrivateKey
 from crypto.triple_des import TripleDES
 from crypto.blowfish import Blowfish
 from crypto.twofish import Twofish
@@ -13,6 +27,8 @@ from crypto.des_impl import DESImpl
 from crypto.ecc import ECC
 from crypto.dsa import DSA
 from crypto.sha256 import SHA256
+from crypto.number_theory import (FixedBaseExponentiation, double_exponentiation, fixed_base_table, is_prime,
+                                  simultaneous_exponentiation, small_primes)
 
 class TestCrypto(unittest.TestCase):
     def setUp(self):
@@ -180,5 +196,721 @@ class TestCrypto(unittest.TestCase):
         hash_value = self.sha256.hash(message)
         self.assertIsNotNone(hash_value)
 
+class TestAES(unittest.TestCase):
+    def setUp(self):
+        elements = {0, 1, 2, 3}
+        addition = lambda a, b: (a + b) % 4
+        multiplication = lambda a, b: (a * b) % 4
+        self.aes = AES(elements, addition, multiplication)
+
+    def test_t_tables(self):
+        # Te0 packs the MixColumns column (2, 1, 1, 3) of the substituted byte
+        for x in (0x00, 0x01, 0x53, 0xff):
+            s = self.aes.s_box[x]
+            expected = (self.aes.galois_mult(s, 2) << 24) | (s << 16) | (s << 8) | self.aes.galois_mult(s, 3)
+            self.assertEqual(self.aes.Te0[x], expected)
+
+    def test_fips197_vector(self):
+        plaintext = list(bytes.fromhex("3243f6a8885a308d313198a2e0370734"))
+        key = list(bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c"))
+        ciphertext = self.aes.encrypt(plaintext, key)
+        self.assertEqual(bytes(ciphertext).hex(), "3925841d02dc09fbdc118597196a0b32")
+        self.assertEqual(self.aes.decrypt(ciphertext, key), plaintext)
+
+    def test_invalid_block_length(self):
+        key = list(range(16))
+        with self.assertRaises(ValueError):
+            self.aes.encrypt([0] * 15, key)
+        with self.assertRaises(ValueError):
+            self.aes.decrypt([0] * 17, key)
+
+    def test_key_sizes(self):
+        # FIPS-197 Appendix C.2 and C.3
+        plaintext = list(bytes.fromhex("00112233445566778899aabbccddeeff"))
+        vectors = [
+            (bytes(range(24)), 52, "dda97ca4864cdfe06eaf70a0ec0d7191"),
+            (bytes(range(32)), 60, "8ea2b7ca516745bfeafc49904b496089"),
+        ]
+        for key, words, expected in vectors:
+            self.assertEqual(len(self.aes.key_expansion(key)), words)
+            ciphertext = self.aes.encrypt(plaintext, key)
+            self.assertEqual(bytes(ciphertext).hex(), expected)
+            self.assertEqual(self.aes.decrypt(ciphertext, key), plaintext)
+        with self.assertRaises(ValueError):
+            self.aes.key_expansion(bytes(20))
+
+    def test_key_schedule_cache(self):
+        aes = AES({0, 1}, lambda a, b: a ^ b, lambda a, b: a & b, schedule_cache_size=2)
+        block = list(range(16))
+        keys = [bytes([i]) * 16 for i in range(3)]
+        aes.encrypt(block, keys[0])
+        aes.decrypt(block, keys[0])
+        self.assertEqual((aes.schedule_cache.hits, aes.schedule_cache.misses), (1, 1))
+
+        schedules = aes.key_schedule(keys[0])
+        expected = tuple(tuple(schedule) for schedule in schedules)
+        aes.key_schedule(keys[1])
+        aes.key_schedule(keys[2])
+        self.assertEqual(len(aes.schedule_cache), 2)
+        # Eviction must leave schedules that callers still hold untouched
+        self.assertEqual(schedules, expected)
+        self.assertEqual(aes.decrypt(aes.encrypt(block, keys[0]), keys[0]), block)
+
+    def test_key_schedule_cache_eviction_during_encryption(self):
+        aes = AES({0, 1}, lambda a, b: a ^ b, lambda a, b: a & b, schedule_cache_size=2)
+        key, counter = bytes(range(32)), bytes(16)
+        data = bytes(range(256)) * 256
+        expected = aes.encrypt_ctr(data, key, counter)
+        stop = threading.Event()
+
+        def churn():
+            i = 0
+            while not stop.is_set():
+                aes.key_schedule(i.to_bytes(16, "big"))
+                i += 1
+
+        thread = threading.Thread(target=churn)
+        thread.start()
+        try:
+            for _ in range(3):
+                self.assertEqual(aes.encrypt_ctr(data, key, counter), expected)
+        finally:
+            stop.set()
+            thread.join()
+
+    def test_modes_of_operation(self):
+        # NIST SP 800-38A, AES-128 vectors F.1.1, F.2.1 and F.5.1
+        key = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+        plaintext = bytes.fromhex("6bc1bee22e409f96e93d7e117393172aae2d8a571e03ac9c9eb76fac45af8e51")
+        iv = bytes(range(16))
+        counter = bytes.fromhex("f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff")
+
+        ecb = self.aes.encrypt_ecb(plaintext, key)
+        self.assertEqual(ecb[:32].hex(), "3ad77bb40d7a3660a89ecaf32466ef97f5d3d58503b9699de785895a96fdbaaf")
+        self.assertEqual(self.aes.decrypt_ecb(ecb, key), plaintext)
+
+        cbc = self.aes.encrypt_cbc(memoryview(plaintext), key, iv)
+        self.assertEqual(cbc[:32].hex(), "7649abac8119b246cee98e9b12e9197d5086cb9b507219ee95db113a917678b2")
+        self.assertEqual(self.aes.decrypt_cbc(cbc, key, iv), plaintext)
+
+        ctr = self.aes.encrypt_ctr(plaintext[:20], key, counter)
+        self.assertEqual(ctr.hex(), "874d6191b620e3261bef6864990db6ce9806f66b")
+        self.assertEqual(self.aes.decrypt_ctr(ctr, key, counter), plaintext[:20])
+
+        with self.assertRaises(ValueError):
+            self.aes.decrypt_cbc(cbc[:-1], key, iv)
+        with self.assertRaises(ValueError):
+            self.aes.encrypt_ctr(plaintext, key, b"short")
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchAES(unittest.TestCase):
+    def setUp(self):
+        self.aes = AES({0, 1}, lambda a, b: a ^ b, lambda a, b: a & b)
+        self.batch = BatchAES(self.aes, batch_blocks=4)
+
+    def test_matches_scalar_aes(self):
+        key = bytes(range(32))
+        blocks = np.arange(5 * 16, dtype=np.uint8).reshape(5, 16)
+        ciphertext = self.batch.encrypt_blocks(blocks, key)
+        for row, block in zip(ciphertext, blocks):
+            self.assertEqual(list(row), self.aes.encrypt(bytes(block), key))
+
+    def test_ctr_matches_scalar_ctr(self):
+        key = bytes(range(16))
+        data = bytes(range(256)) * 2 + b"tail"
+        for counter in (bytes(16), b"\xff" * 16, bytes(8) + b"\xff" * 8):
+            expected = self.aes.encrypt_ctr(data, key, counter)
+            self.assertEqual(self.batch.encrypt_ctr(data, key, counter), expected)
+            self.assertEqual(self.batch.decrypt_ctr(expected, key, counter), data)
+
+    def test_rejects_invalid_batch_blocks(self):
+        for batch_blocks in (0, -1, 1.5, None):
+            with self.assertRaises(ValueError):
+                BatchAES(self.aes, batch_blocks=batch_blocks)
+
+class TestGCM(unittest.TestCase):
+    def setUp(self):
+        self.gcm = GCM(AES({0, 1}, lambda a, b: a ^ b, lambda a, b: a & b))
+        self.key = bytes.fromhex("feffe9928665731c6d6a8f9467308308")
+        self.plaintext = bytes.fromhex(
+            "d9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a72"
+            "1c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b39")
+        self.aad = bytes.fromhex("feedfacedeadbeeffeedfacedeadbeefabaddad2")
+        self.iv = bytes.fromhex("cafebabefacedbaddecaf888")
+
+    def test_gf128_tables(self):
+        h = 0x66e94bd4ef8a2c3b884cfa59ca342b2e
+        tables = gf128_tables(h)
+        for x in (0, 1 << 127, 0x0388dace60b6a392f328c2b971b2fe78):
+            self.assertEqual(gf128_table_multiply(tables, x), gf128_multiply(x, h))
+
+    def test_spec_vectors(self):
+        # Test case 4 of the GCM specification (McGrew and Viega)
+        ciphertext, tag = self.gcm.encrypt(self.plaintext, self.key, self.iv, self.aad)
+        self.assertEqual(ciphertext.hex(),
+                         "42831ec2217774244b7221b784d0d49ce3aa212f2c02a4e035c17e2329aca12e"
+                         "21d514b25466931c7d8f6a5aac84aa051ba30b396a0aac973d58e091")
+        self.assertEqual(tag.hex(), "5bc94fbc3221a5db94fae95ae7121a47")
+        self.assertEqual(self.gcm.decrypt(ciphertext, self.key, self.iv, tag, self.aad), self.plaintext)
+
+        # Test case 1: empty plaintext under the all-zero key and IV
+        _, tag = self.gcm.encrypt(b"", bytes(16), bytes(12))
+        self.assertEqual(tag.hex(), "58e2fccefa7e3061367f1d57a4e7455a")
+
+    def test_tampering_is_rejected(self):
+        ciphertext, tag = self.gcm.encrypt(self.plaintext, self.key, self.iv, self.aad)
+        ciphertext[0] ^= 1
+        with self.assertRaises(ValueError):
+            self.gcm.decrypt(ciphertext, self.key, self.iv, tag, self.aad)
+        ciphertext[0] ^= 1
+        with self.assertRaises(ValueError):
+            self.gcm.decrypt(ciphertext, self.key, self.iv, tag, b"other aad")
+
+    def test_hash_key_cache_eviction_during_encryption(self):
+        aes = AES({0, 1}, lambda a, b: a ^ b, lambda a, b: a & b, schedule_cache_size=2)
+        gcm = GCM(aes, cache_size=2)
+        data = bytes(range(256)) * 64
+        expected = gcm.encrypt(data, self.key, bytes(12))
+        stop = threading.Event()
+
+        def churn():
+            i = 0
+            while not stop.is_set():
+                key = i.to_bytes(16, "big")
+                gcm._hash_tables(key, aes.key_schedule(key)[0])
+                i += 1
+
+        thread = threading.Thread(target=churn)
+        thread.start()
+        try:
+            for _ in range(3):
+                self.assertEqual(gcm.encrypt(data, self.key, bytes(12)), expected)
+        finally:
+            stop.set()
+            thread.join()
+
+class TestPBKDF2(unittest.TestCase):
+    def test_rfc6070_vectors(self):
+        self.assertEqual(pbkdf2_hmac('sha1', b"password", b"salt", 1, 20).hex(),
+                         "0c60c80f961f0e71f3a9b524af6012062fe037a6")
+        self.assertEqual(pbkdf2_hmac('sha1', b"password", b"salt", 4096, 20).hex(),
+                         "4b007901b765489abead49d926f721d065a429c1")
+        self.assertEqual(pbkdf2_hmac('sha1', b"passwordPASSWORDpassword", b"saltSALTsaltSALTsaltSALTsaltSALTsalt",
+                                     4096, 25).hex(),
+                         "3d2eec4fe41c849b80c8d83662c0e44a8b291a964cf2f07038")
+
+    def test_matches_hashlib(self):
+        for password in (b"", b"secret", b"k" * 100):
+            for dklen in (None, 16, 64, 100):
+                self.assertEqual(pbkdf2_hmac('sha256', password, b"salt", 3, dklen),
+                                 hashlib.pbkdf2_hmac('sha256', password, b"salt", 3, dklen))
+
+    def test_parallel_blocks(self):
+        expected = hashlib.pbkdf2_hmac('sha256', b"password", b"salt", 10, 100)
+        self.assertEqual(pbkdf2_hmac('sha256', b"password", b"salt", 10, 100, workers=2), expected)
+        with self.assertRaises(ValueError):
+            pbkdf2_hmac('sha256', b"password", b"salt", 10, 100, workers=0)
+
+    def test_batch(self):
+        pairs = [(b"password%d" % i, b"salt%d" % i) for i in range(7)]
+        expected = [hashlib.pbkdf2_hmac('sha256', password, salt, 4, 40) for password, salt in pairs]
+        self.assertEqual(list(pbkdf2_hmac_batch('sha256', pairs, 4, 40)), expected)
+        self.assertEqual(list(pbkdf2_hmac_batch('sha256', iter(pairs), 4, 40, workers=2, chunksize=2)), expected)
+        with self.assertRaises(TypeError):
+            list(pbkdf2_hmac_batch('sha256', [("password", b"salt")], 4))
+
+    def test_derived_key_cache(self):
+        now = [0.0]
+        cache = DerivedKeyCache(max_entries=2, ttl=10.0, clock=lambda: now[0])
+        expected = pbkdf2_hmac('sha256', b"password", b"salt", 5, 32)
+        self.assertEqual(cache.derive('sha256', b"password", b"salt", 5, 32), expected)
+        self.assertEqual(cache.derive('sha256', b"password", b"salt", 5, 32), expected)
+        self.assertEqual((cache.hits, cache.misses, cache.hit_rate), (1, 1, 0.5))
+
+        # Different parameters are different entries; the least recently used one is evicted
+        cache.derive('sha256', b"password", b"salt", 6, 32)
+        cache.derive('sha256', b"other", b"salt", 5, 32)
+        self.assertEqual(len(cache), 2)
+        cache.derive('sha256', b"password", b"salt", 5, 32)
+        self.assertEqual(cache.misses, 4)
+
+        # Entries expire after the TTL
+        now[0] = 11.0
+        cache.derive('sha256', b"password", b"salt", 5, 32)
+        self.assertEqual((cache.misses, len(cache)), (5, 1))
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+class TestSHA256(unittest.TestCase):
+    def setUp(self):
+        self.sha256 = SHA256()
+        self.expected = hashlib.sha256(b"hello world").hexdigest()
+
+    def test_hash_is_stateless(self):
+        self.assertEqual(self.sha256.hash("hello world"), self.expected)
+        self.assertEqual(self.sha256.hash("hello world"), self.expected)
+        self.assertEqual(self.sha256.hash(b"hello world"), self.expected)
+
+    def test_incremental_and_copy(self):
+        self.sha256.update(b"hello ")
+        prefix = self.sha256.copy()
+        self.sha256.update(memoryview(b"world"))
+        self.assertEqual(self.sha256.hexdigest(), self.expected)
+        prefix.update(b"there")
+        self.assertEqual(prefix.digest(), hashlib.sha256(b"hello there").digest())
+
+    def test_hash_iter_and_file(self):
+        self.assertEqual(self.sha256.hash_iter([b"hello", b" ", bytearray(b"world")]), self.expected)
+        data = bytes(range(256)) * 100
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.bin")
+            with open(path, "wb") as f:
+                f.write(data)
+            expected = hashlib.sha256(data).hexdigest()
+            self.assertEqual(self.sha256.hash_file(path, chunk_size=1000), expected)
+            self.assertEqual(self.sha256.hash_file(path, chunk_size=1000, use_mmap=False), expected)
+            open(path, "wb").close()
+            self.assertEqual(self.sha256.hash_file(path), hashlib.sha256(b"").hexdigest())
+            for chunk_size in (0, -1, 1.5):
+                for use_mmap in (True, False):
+                    with self.assertRaises(ValueError):
+                        self.sha256.hash_file(path, chunk_size=chunk_size, use_mmap=use_mmap)
+
+    def test_hash_many(self):
+        messages = ["id-%d" % i for i in range(50)] + [b"raw", bytearray(b"buffer"), ""]
+        expected = [hashlib.sha256(m.encode() if isinstance(m, str) else bytes(m)).digest() for m in messages]
+        self.assertEqual(self.sha256.hash_many(messages), expected)
+        self.assertEqual(self.sha256.hash_many(iter(messages), hex=True), [d.hex() for d in expected])
+        self.assertEqual(self.sha256.hash_many(messages, workers=3, batch_size=7), expected)
+        self.assertEqual(self.sha256.hash_many([], workers=2), [])
+
+    def test_tree_hash(self):
+        data = bytes(range(256)) * 20
+        leaf = lambda chunk: hashlib.sha256(b"\x00" + chunk).digest()
+        node = lambda left, right: hashlib.sha256(b"\x01" + left + right).digest()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "image.bin")
+            with open(path, "wb") as f:
+                f.write(data)
+            root, leaves = self.sha256.tree_hash(path, leaf_size=2048, workers=2)
+            expected = [leaf(data[i:i + 2048]) for i in range(0, len(data), 2048)]
+            self.assertEqual(leaves, expected)
+            self.assertEqual(root, node(node(expected[0], expected[1]), expected[2]).hex())
+
+            # Re-hash only the changed leaf and rebuild the root
+            with open(path, "r+b") as f:
+                f.seek(3000)
+                f.write(b"changed")
+            changed = self.sha256.hash_leaves(path, [1], leaf_size=2048)
+            self.assertNotEqual(changed[1], leaves[1])
+            leaves[1] = changed[1]
+            self.assertEqual(self.sha256.merkle_root(leaves).hex(), self.sha256.tree_hash(path, leaf_size=2048)[0])
+
+class TestEncryption(unittest.TestCase):
+    def setUp(self):
+        elements = {0, 1, 2, 3}
+        addition = lambda a, b: (a + b) % 4
+        multiplication = lambda a, b: (a * b) % 4
+        galois_field = GaloisField(elements, addition, multiplication)
+        self.encryption = Encryption(galois_field)
+        self.decryption = Decryption(galois_field)
+        self.key = bytes(range(32))
+
+    def test_long_message_round_trip(self):
+        plaintext = "The quick brown fox jumps over the lazy dog. " * 10
+        ciphertext, mac = self.encryption.encrypt(plaintext, self.key)
+        self.assertEqual(len(ciphertext), 16 + len(plaintext))
+        self.assertEqual(self.decryption.decrypt(ciphertext, self.key, mac), plaintext)
+
+        tampered = ciphertext[:-1] + bytes([ciphertext[-1] ^ 1])
+        with self.assertRaises(ValueError):
+            self.decryption.decrypt(tampered, self.key, mac)
+
+    def test_shared_key_cache(self):
+        cache = DerivedKeyCache()
+        encryption = Encryption(self.encryption.galois_field, key_cache=cache)
+        decryption = Decryption(self.encryption.galois_field, key_cache=cache)
+        key = encryption.generate_key(b"password", b"salt")
+        self.assertEqual(decryption.generate_key(b"password", b"salt"), key)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_stream_round_trip(self):
+        plaintext = bytes(range(256)) * 20 + b"odd tail"
+        encrypted = io.BytesIO()
+        mac = self.encryption.encrypt_stream(io.BytesIO(plaintext), encrypted, self.key, chunk_size=64)
+        self.assertEqual(len(encrypted.getvalue()), 16 + len(plaintext))
+
+        decrypted = io.BytesIO()
+        self.decryption.decrypt_stream(io.BytesIO(encrypted.getvalue()), decrypted, self.key, mac, chunk_size=128)
+        self.assertEqual(decrypted.getvalue(), plaintext)
+
+        # Streams interoperate with the one-shot API
+        text = "streamed message"
+        encrypted = io.BytesIO()
+        mac = self.encryption.encrypt_stream(io.BytesIO(text.encode('utf-8')), encrypted, self.key)
+        self.assertEqual(self.decryption.decrypt(encrypted.getvalue(), self.key, mac), text)
+
+        with self.assertRaises(ValueError):
+            self.decryption.decrypt_stream(io.BytesIO(encrypted.getvalue()), io.BytesIO(), self.key, bytes(32))
+
+    def test_stream_rejects_non_blocking_reader(self):
+        class NonBlockingReader(io.RawIOBase):
+            """Returns 3 bytes, then None ("no data yet"), then the rest."""
+            def __init__(self, parts):
+                self.parts = list(parts)
+
+            def readable(self):
+                return True
+
+            def readinto(self, buffer):
+                part = self.parts.pop(0) if self.parts else b""
+                if part is None:
+                    return None
+                buffer[:len(part)] = part
+                return len(part)
+
+        with self.assertRaises(BlockingIOError):
+            self.encryption.encrypt_stream(NonBlockingReader([b"abc", None, b"def"]), io.BytesIO(), self.key)
+
+        class ReadOnly:
+            def __init__(self, parts):
+                self.parts = list(parts)
+
+            def read(self, size):
+                return self.parts.pop(0) if self.parts else b""
+
+        with self.assertRaises(BlockingIOError):
+            self.encryption.encrypt_stream(ReadOnly([b"abc", None, b"def"]), io.BytesIO(), self.key)
+
+    def test_file_round_trip(self):
+        plaintext = bytes(range(256)) * 40 + b"odd tail"
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "plain.bin")
+            with open(path, "wb") as f:
+                f.write(plaintext)
+            mac = self.encryption.encrypt_file(path, path + ".enc", self.key, chunk_size=1024)
+            self.decryption.decrypt_file(path + ".enc", path + ".dec", self.key, mac, chunk_size=512)
+            with open(path + ".dec", "rb") as f:
+                self.assertEqual(f.read(), plaintext)
+
+            # Files use the same format as streams
+            with open(path + ".enc", "rb") as f:
+                decrypted = io.BytesIO()
+                self.decryption.decrypt_stream(f, decrypted, self.key, mac)
+            self.assertEqual(decrypted.getvalue(), plaintext)
+
+            with self.assertRaises(ValueError):
+                self.decryption.decrypt_file(path + ".enc", path + ".bad", self.key, bytes(32))
+
+    def test_parallel_round_trip(self):
+        plaintext = bytes(range(256)) * 8 + b"odd tail"
+        backends = ["python"] + (["numpy"] if np is not None else [])
+        for backend in backends:
+            ciphertext, mac = self.encryption.encrypt_parallel(plaintext, self.key, workers=2, backend=backend,
+                                                               segment_size=256)
+            self.assertEqual(len(ciphertext), 16 + len(plaintext))
+            decrypted = io.BytesIO()
+            self.decryption.decrypt_stream(io.BytesIO(ciphertext), decrypted, self.key, mac)
+            self.assertEqual(decrypted.getvalue(), plaintext)
+        with self.assertRaises(ValueError):
+            self.encryption.encrypt_parallel(plaintext, self.key, segment_size=100)
+
+    def test_parallel_bounds_segments_in_flight(self):
+        class CountingExecutor(ThreadPoolExecutor):
+            def __init__(self):
+                super().__init__(max_workers=2)
+                self.futures = []
+                self.peak = 0
+
+            def submit(self, fn, *args):
+                self.futures.append(super().submit(fn, *args))
+                self.peak = max(self.peak, sum(not future.done() for future in self.futures))
+                return self.futures[-1]
+
+        plaintext = bytes(range(256)) * 64
+        with CountingExecutor() as executor:
+            ciphertext, mac = self.encryption.encrypt_parallel(plaintext, self.key, workers=2, segment_size=256,
+                                                               executor=executor)
+        self.assertLessEqual(executor.peak, 4)
+        decrypted = io.BytesIO()
+        self.decryption.decrypt_stream(io.BytesIO(ciphertext), decrypted, self.key, mac)
+        self.assertEqual(decrypted.getvalue(), plaintext)
+
+    def test_async_round_trip_and_cancellation(self):
+        executor = AsyncExecutor(max_workers=1, max_pending=1)
+        encryption = Encryption(self.encryption.galois_field, executor)
+        decryption = Decryption(self.encryption.galois_field, executor)
+        release = threading.Event()
+
+        async def scenario():
+            ciphertext, mac = await encryption.encrypt_async("async hello", self.key)
+            self.assertEqual(await decryption.decrypt_async(ciphertext, self.key, mac), "async hello")
+
+            # With one pending slot taken, the next job waits and can be cancelled before it runs
+            blocker = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0)
+            queued = asyncio.ensure_future(encryption.encrypt_async("never runs", self.key))
+            await asyncio.sleep(0)
+            queued.cancel()
+            release.set()
+            await blocker
+            with self.assertRaises(asyncio.CancelledError):
+                await queued
+            ciphertext, mac = await encryption.encrypt_async("after cancel", self.key)
+            self.assertEqual(await decryption.decrypt_async(ciphertext, self.key, mac), "after cancel")
+
+        asyncio.run(scenario())
+        executor.shutdown()
+
+    def test_async_encrypt_not_queued_behind_key_derivations(self):
+        executor = AsyncExecutor(max_workers=2, max_pending=2, max_key_derivations=1)
+        encryption = Encryption(self.encryption.galois_field, executor)
+        release = threading.Event()
+
+        async def scenario():
+            # One derivation runs and the rest wait on the derivation cap, not on pending slots
+            derivations = [asyncio.ensure_future(executor.run(release.wait, key_derivation=True))
+                           for _ in range(5)]
+            await asyncio.sleep(0)
+            try:
+                ciphertext, mac = await asyncio.wait_for(encryption.encrypt_async("hi", self.key), 10)
+                self.assertFalse(any(derivation.done() for derivation in derivations))
+            finally:
+                release.set()
+                await asyncio.gather(*derivations)
+            self.assertEqual(self.decryption.decrypt(ciphertext, self.key, mac), "hi")
+
+        asyncio.run(scenario())
+        executor.shutdown()
+
+    def test_async_on_process_pool(self):
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            executor = AsyncExecutor(executor=pool)
+            cache = DerivedKeyCache()
+            encryption = Encryption(self.encryption.galois_field, executor, key_cache=cache)
+            decryption = Decryption(self.encryption.galois_field, executor, key_cache=cache)
+
+            async def scenario():
+                key = await encryption.generate_key_async(b"password", b"salt")
+                self.assertEqual(key, pbkdf2_hmac('sha256', b"password", b"salt", 100000, 32))
+                self.assertEqual(await decryption.generate_key_async(b"password", b"salt"), key)
+                self.assertEqual((cache.hits, cache.misses), (1, 1))
+                ciphertext, mac = await encryption.encrypt_async("over processes", key)
+                self.assertEqual(await decryption.decrypt_async(ciphertext, key, mac), "over processes")
+                with self.assertRaises(ValueError):
+                    await decryption.decrypt_async(ciphertext, key, bytes(32))
+
+            asyncio.run(scenario())
+
+    def test_async_executor_across_event_loops(self):
+        executor = AsyncExecutor(max_workers=1, max_pending=1)
+        encryption = Encryption(self.encryption.galois_field, executor)
+
+        async def scenario(text):
+            # Contend for the single pending slot so the semaphore binds to this loop
+            results = await asyncio.gather(encryption.encrypt_async(text, self.key),
+                                           encryption.encrypt_async(text, self.key))
+            return [self.decryption.decrypt(ciphertext, self.key, mac) for ciphertext, mac in results]
+
+        self.assertEqual(asyncio.run(scenario("first")), ["first", "first"])
+        self.assertEqual(asyncio.run(scenario("second")), ["second", "second"])
+        executor.shutdown()
+
+class TestNumberTheory(unittest.TestCase):
+    def test_small_primes(self):
+        self.assertEqual(small_primes(30), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        self.assertEqual(small_primes(2), [])
+        self.assertEqual(len(small_primes(1 << 16)), 6542)
+
+    def test_is_prime_matches_trial_division(self):
+        def trial_division(n):
+            return n > 1 and all(n % i for i in range(2, int(n ** 0.5) + 1))
+        for n in list(range(-2, 3000)) + list(range(999000, 1003000)):
+            self.assertEqual(is_prime(n), trial_division(n), n)
+
+    def test_is_prime_large(self):
+        self.assertTrue(is_prime(2 ** 61 - 1))
+        self.assertTrue(is_prime(2 ** 64 - 59))
+        self.assertTrue(is_prime(2 ** 521 - 1))
+        self.assertFalse(is_prime((2 ** 89 - 1) * (2 ** 107 - 1)))
+        # Carmichael numbers and strong pseudoprimes to several small bases
+        for n in (561, 41041, 3215031751, 3825123056546413051, 318665857834031151167461):
+            self.assertFalse(is_prime(n), n)
+        self.assertFalse(is_prime((2 ** 89 - 1) * (2 ** 107 - 1), rounds=1))
+        for rounds in (0, -1):
+            with self.assertRaises(ValueError):
+                is_prime((2 ** 89 - 1) * (2 ** 107 - 1), rounds=rounds)
+
+    def test_fixed_base_exponentiation(self):
+        modulus = 2 ** 127 - 1
+        table = FixedBaseExponentiation(3, modulus, 64, window=5)
+        for exponent in (0, 1, 31, 32, 2 ** 64 - 1, 0x123456789ABCDEF):
+            self.assertEqual(table.pow(exponent), pow(3, exponent, modulus))
+        # Exponents outside the table fall back to pow
+        self.assertEqual(table.pow(2 ** 64 + 5), pow(3, 2 ** 64 + 5, modulus))
+        self.assertEqual(FixedBaseExponentiation(5, 1, 8).pow(3), 0)
+        self.assertIs(fixed_base_table(3, modulus, 64), fixed_base_table(3, modulus, 64))
+        with self.assertRaises(ValueError):
+            FixedBaseExponentiation(3, modulus, 0)
+
+    def test_double_exponentiation(self):
+        modulus = 2 ** 127 - 1
+        for a, b in ((0, 0), (0, 5), (5, 0), (1, 1), (2 ** 130 + 7, 3), (12345678901, 98765432109)):
+            for window in (1, 2, 3):
+                self.assertEqual(double_exponentiation(3, a, 7, b, modulus, window),
+                                 pow(3, a, modulus) * pow(7, b, modulus) % modulus)
+        self.assertEqual(double_exponentiation(3, 0, 7, 0, 1), 0)
+        # Any group works, e.g. integers under addition: 3a + 7b
+        self.assertEqual(simultaneous_exponentiation(3, 10, 7, 6, lambda u, v: u + v), 72)
+        self.assertIsNone(simultaneous_exponentiation(3, 0, 7, 0, lambda u, v: u + v))
+        with self.assertRaises(ValueError):
+            double_exponentiation(3, -1, 7, 1, modulus)
+
+    def test_ecc_double_scalar_multiplication(self):
+        ecc = ECC({0, 1}, lambda a, b: a ^ b, lambda a, b: a & b, 2, 3)
+        ecc.p = 97  # the curve arithmetic reads the field prime from p
+        P = (86, 69)  # a point of order 50 on y^2 = x^3 + 2x + 3 over GF(97)
+
+        def multiple(k):
+            R = P
+            for _ in range(k - 1):
+                R = ecc.point_addition(R, P)
+            return R
+
+        Q = multiple(7)
+        for k1, k2 in ((5, 3), (13, 2), (0, 4), (9, 0)):
+            self.assertEqual(ecc.double_scalar_multiplication(k1, P, k2, Q), multiple(k1 + 7 * k2))
+
+class TestDSA(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Small DSA parameters: a 160-bit q dividing p - 1 for a 512-bit prime p
+        rng = random.Random(1234)
+        q = next(n for n in iter(lambda: rng.getrandbits(160) | (1 << 159) | 1, None) if is_prime(n))
+        p = next(n for n in iter(lambda: (rng.getrandbits(352) | (1 << 351)) * q * 2 + 1, None) if is_prime(n))
+        g = pow(2, (p - 1) // q, p)
+        cls.parameters = (p, q, g)
+
+    def setUp(self):
+        elements = {0, 1, 2, 3}
+        addition = lambda a, b: (a + b) % 4
+        multiplication = lambda a, b: (a * b) % 4
+        self.dsa = DSA(elements, addition, multiplication, *self.parameters)
+
+    def test_sign_verify(self):
+        private_key, public_key = self.dsa.generate_keys()
+        self.assertEqual(public_key, pow(self.dsa.g, private_key, self.dsa.p))
+        signature = self.dsa.sign("hello", private_key)
+        self.assertTrue(self.dsa.verify("hello", signature, public_key))
+        self.assertFalse(self.dsa.verify("hellp", signature, public_key))
+        self.assertFalse(self.dsa.verify("hello", (signature[0], 0), public_key))
+
+    def test_g_table_is_shared(self):
+        other = DSA({0, 1}, lambda a, b: a ^ b, lambda a, b: a & b, *self.parameters)
+        self.assertIs(self.dsa.g_table, other.g_table)
+
+class TestRSA(unittest.TestCase):
+    def setUp(self):
+        self.rsa = RSA(key_size=512)
+
+    def test_generate_prime(self):
+        for bits in (16, 256):
+            prime = self.rsa.generate_prime(bits)
+            self.assertTrue(is_prime(prime))
+            self.assertEqual(prime.bit_length(), bits)
+            self.assertEqual(prime >> (bits - 2), 3)
+        with self.assertRaises(ValueError):
+            self.rsa.generate_prime(8)
+
+    def test_search_window_finds_next_prime(self):
+        start = (3 << 30) | 1
+        expected = next(n for n in range(start, 1 << 32, 2) if is_prime(n))
+        self.assertEqual(self.rsa._search_window(start, 32), expected)
+        # Candidates beyond the bit size are not returned
+        self.assertIsNone(self.rsa._search_window((1 << 16) - 13, 16))
+
+    def test_crt_private_key(self):
+        private_key, public_key = self.rsa.generate_keys()
+        self.assertIsInstance(private_key, RSAPrivateKey)
+        d, n = private_key
+        self.assertEqual(private_key, (d, n))
+        self.assertEqual(private_key.p * private_key.q, n)
+        self.assertNotIn(str(d), repr(private_key))
+        for c in (0, 1, 2, 99991, n - 1):
+            self.assertEqual(private_key.power(c), pow(c, d, n))
+        ciphertext = self.rsa.encrypt("hello", public_key)
+        self.assertEqual(self.rsa.decrypt(ciphertext, private_key), "hello")
+        # Legacy (d, n) tuples still decrypt without CRT
+        self.assertEqual(self.rsa.decrypt(ciphertext, (d, n)), "hello")
+        with self.assertRaises(ValueError):
+            RSAPrivateKey(d, n, private_key.p, private_key.q + 2)
+        with self.assertRaises(ValueError):
+            RSAPrivateKey(d, n, private_key.p)
+
+    def test_oaep(self):
+        rsa = RSA(key_size=1024)
+        private_key, public_key = rsa.generate_keys()
+        for message in (b"", b"x", bytes(range(256)) * 3):
+            ciphertext = rsa.encrypt_oaep(message, public_key, label=b"label")
+            self.assertEqual(len(ciphertext), 128 * max(1, -(-len(message) // 62)))
+            self.assertEqual(rsa.decrypt_oaep(ciphertext, private_key, label=b"label"), message)
+        self.assertEqual(rsa.decrypt_oaep(rsa.encrypt_oaep("héllo", public_key), tuple(private_key)), "héllo".encode())
+        # Encryption is randomized
+        self.assertNotEqual(rsa.encrypt_oaep(b"same", public_key), rsa.encrypt_oaep(b"same", public_key))
+
+        ciphertext = rsa.encrypt_oaep(b"secret", public_key)
+        tampered = bytearray(ciphertext)
+        tampered[10] ^= 1
+        for bad, label in ((ciphertext, b"other"), (bytes(tampered), b""), (ciphertext[:-1], b"")):
+            with self.assertRaises(ValueError):
+                rsa.decrypt_oaep(bad, private_key, label=label)
+        with self.assertRaises(ValueError):
+            self.rsa.encrypt_oaep(b"x", self.rsa.generate_keys()[1])  # 512-bit keys are too small
+
+        # Blocks are bound to their position, the block count and the blocks before them
+        message = bytes(range(124))
+        ciphertext = rsa.encrypt_oaep(message, public_key)
+        other = rsa.encrypt_oaep(bytes(124), public_key)
+        first, second = ciphertext[:128], ciphertext[128:]
+        for bad in (second + first, first, second, first + first, first + other[128:], other[:128] + second, ciphertext + second):
+            with self.assertRaises(ValueError):
+                rsa.decrypt_oaep(bad, private_key)
+
+    def test_decrypt_batch(self):
+        rsa = RSA(key_size=1024)
+        private_key, public_key = rsa.generate_keys()
+        ciphertexts = [rsa.encrypt_oaep(b"record %d" % i, public_key) for i in range(40)]
+        ciphertexts[5] = ciphertexts[5][:-1]
+        ciphertexts[9] = rsa.encrypt("legacy", public_key)
+        expected = [b"record %d" % i for i in range(40)]
+        expected[9] = "legacy"
+        for workers in (None, 2):
+            results = rsa.decrypt_batch(ciphertexts, private_key, workers=workers, chunksize=8)
+            self.assertIsInstance(results[5], ValueError)
+            del results[5]
+            self.assertEqual(results, expected[:5] + expected[6:])
+        self.assertEqual(rsa.decrypt_batch([], private_key, workers=2), [])
+
+    def assertKeyPair(self, private_key, public_key):
+        (d, n), (e, n_public) = private_key, public_key
+        self.assertEqual(n, n_public)
+        self.assertEqual(n.bit_length(), self.rsa.key_size)
+        for message in (2, 12345, n - 2):
+            self.assertEqual(pow(pow(message, e, n), d, n), message)
+
+    def test_generate_keys_parallel(self):
+        self.assertKeyPair(*self.rsa.generate_keys(workers=2))
+        with self.assertRaises(ValueError):
+            self.rsa.generate_keys(workers=0)
+
+    def test_generate_keys_batch(self):
+        keys = list(self.rsa.generate_keys_batch(3, workers=2))
+        self.assertEqual(len(keys), 3)
+        for private_key, public_key in keys:
+            self.assertKeyPair(private_key, public_key)
+        self.assertEqual(len({public_key[1] for _, public_key in keys}), 3)
+        self.assertEqual(len(list(self.rsa.generate_keys_batch(2, workers=1))), 2)
+
 if __name__ == "__main__":
     unittest.main()
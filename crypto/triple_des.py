@@ -1,4 +1,4 @@
-from crypto.3des_impl import TripleDESImpl
+from crypto.triple_des_impl import TripleDESImpl
 
 class TripleDES:
     """Represents the Triple DES (3DES) algorithm."""
@@ -0,0 +1,75 @@
+"""
+Arithmetic in GF(2^128) as used by GHASH in AES-GCM (NIST SP 800-38D).
+
+Field elements are 128-bit integers in GCM bit order: the most significant bit
+of the integer is the coefficient of x^0, and the field is reduced modulo
+x^128 + x^7 + x^2 + x + 1.
+"""
+
+R = 0xE1 << 120
+
+
+def gf128_multiply(x, y):
+    """
+    Multiply two elements of GF(2^128) bit by bit (Algorithm 1 of SP 800-38D).
+
+    Args:
+        x (int): The first element.
+        y (int): The second element.
+
+    Returns:
+        int: The product x * y.
+    """
+    z = 0
+    v = y
+    for i in range(127, -1, -1):
+        if (x >> i) & 1:
+            z ^= v
+        v = (v >> 1) ^ R if v & 1 else v >> 1
+    return z
+
+
+def gf128_tables(h):
+    """
+    Precompute 8-bit multiplication tables for a fixed element h.
+
+    Table i maps a byte value b to (b placed in byte i of a block) * h, so a full
+    product needs sixteen lookups and XORs instead of 128 shift-and-add steps.
+
+    Args:
+        h (int): The fixed multiplicand, e.g. the GHASH subkey H.
+
+    Returns:
+        tuple: Sixteen lists of 256 ints, one per byte position (most significant first).
+    """
+    # basis[k] = h * x^k, obtained by repeatedly multiplying by x
+    basis = [h]
+    for _ in range(127):
+        v = basis[-1]
+        basis.append((v >> 1) ^ R if v & 1 else v >> 1)
+    tables = []
+    for i in range(16):
+        table = [0] * 256
+        for b in range(1, 256):
+            low = b & -b
+            # The lowest set bit of b is bit (7 - j) of byte i, i.e. x^(8i + j)
+            table[b] = table[b ^ low] ^ basis[8 * i + 8 - low.bit_length()]
+        tables.append(table)
+    return tuple(tables)
+
+
+def gf128_table_multiply(tables, x):
+    """
+    Multiply x by the fixed element whose tables were built with ``gf128_tables``.
+
+    Args:
+        tables (tuple): The tables returned by ``gf128_tables``.
+        x (int): The element to multiply.
+
+    Returns:
+        int: The product.
+    """
+    z = 0
+    for table, byte in zip(tables, x.to_bytes(16, 'big')):
+        z ^= table[byte]
+    return z
@@ -13,6 +13,7 @@ class Ring(Group):
             multiplication (callable): The multiplication operation for the ring.
         """
         super().__init__(elements, addition)
+        self.addition = addition
         self.multiplication = multiplication
 
     def is_ring(self):